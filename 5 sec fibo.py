@@ -2,10 +2,14 @@ import asyncio
 import time
 import logging
 import datetime
-import pytz
 from quotexapi.config import email, password
 from quotexapi.stable_api import Quotex
 from quotexapi.utils.processor import process_candles
+from position_manager import PositionManager
+from bot_config import ConfigWatcher
+from session_calendar import IST
+from batch_indicators import PriceMatrix
+from correlation_tracker import CorrelationTracker
 
 # Logging configuration
 logging.basicConfig(
@@ -13,14 +17,63 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# Global variable to control single active trade
-global_trade_active = False  
+# Shared position manager: caps concurrent trades and exposure per asset/currency
+position_manager = PositionManager()
+
+# Return correlations between the scanned assets, fed from the candles the scanner fetches
+correlations = CorrelationTracker()
+correlation_settings = {"enabled": False}
+latest_candles = {}  # asset -> candles from the latest scan
+
+# Don't open an asset in the same correlation cluster as one already open
+def correlated_open_asset(asset, open_assets):
+    if not correlation_settings["enabled"] or not open_assets:
+        return None
+    cluster = correlations.cluster_of(asset, correlation_settings["threshold"])
+    return next((other for other in open_assets if other != asset and other in cluster), None)
+
+position_manager.correlated_with = correlated_open_asset
+
+# This bot's own settings live in the "fibo" section of bot_config.json
+REQUIRED_KEYS = ["fibo.assets", "fibo.stake", "positions"]
+
+# Trade settings (loaded from bot_config.json)
+ASSETS = []
+STAKE = 0
+DURATION = 5
+CANDLE_PERIOD = 5
+
+# Reads the "fibo" settings; raises on a malformed section so a bad reload is rejected
+def read_settings(cfg):
+    settings = cfg["fibo"]
+    limits = cfg["positions"]
+    for key in ("max_open_trades", "max_trades_per_asset", "max_currency_exposure", "max_total_exposure"):
+        float(limits[key])
+    int(cfg["correlation"]["window"]), float(cfg["correlation"]["threshold"])
+    return list(settings["assets"]), float(settings["stake"]), int(settings["duration"])
+
+# Apply the "fibo" settings, "positions" limits and "correlation" check; called at startup and on reload
+def apply_config(cfg):
+    global ASSETS, STAKE, DURATION, correlation_settings
+
+    ASSETS, STAKE, DURATION = read_settings(cfg)
+    correlation_settings = dict(cfg["correlation"])
+    if correlations.window != correlation_settings["window"]:
+        correlations.window = correlation_settings["window"]
+        correlations.reset(correlations.assets)
+    limits = cfg["positions"]
+    position_manager.max_open_trades = limits["max_open_trades"]
+    position_manager.max_trades_per_asset = limits["max_trades_per_asset"]
+    position_manager.max_currency_exposure = limits["max_currency_exposure"]
+    position_manager.max_total_exposure = limits["max_total_exposure"]
+    logging.info(f"⚙️ Stake: {STAKE} | Duration: {DURATION}s | Assets: {len(ASSETS)}")
+    logging.info(position_manager.summary())
+
+pending_trades = set()  # Keep references so running trade tasks are not garbage collected
 
 # Convert UTC timestamp to IST
 def convert_to_ist(timestamp_utc):
-    utc_time = datetime.datetime.utcfromtimestamp(timestamp_utc)
-    india_timezone = pytz.timezone('Asia/Kolkata')
-    india_time = utc_time.replace(tzinfo=pytz.utc).astimezone(india_timezone)
+    india_time = datetime.datetime.fromtimestamp(timestamp_utc, IST)
     return india_time.strftime('%Y-%m-%d %H:%M:%S')
 
 # Calculate Fibonacci retracement levels
@@ -35,26 +88,24 @@ def fibonacci_levels(high, low):
         "0.786": high - (diff * 0.786),
     }
 
-async def get_live_candles_and_trade(client, assets):
-    """Continuously scan assets and place one trade at a time."""
-    global global_trade_active
-
+async def get_live_candles_and_trade(client):
+    """Continuously scan the configured assets and place trades within the position limits."""
     while True:
-        if global_trade_active:
-            logging.info("A trade is active. Waiting for completion before placing a new one.")
-            await asyncio.sleep(5)
+        if not ASSETS:
+            await asyncio.sleep(2)
             continue
-
-        for asset in assets:
-            if global_trade_active:  
-                break  # Skip to next loop if trade is active
+        for asset in ASSETS:
+            if not position_manager.can_open(asset, STAKE):
+                # Asset or currency already at its exposure limit; yield so open trades can settle
+                await asyncio.sleep(2)
+                continue
 
             current_time = time.time()
-            candles = await client.get_candles(asset, current_time, 10, 5)
+            candles = await client.get_candles(asset, current_time, 10, CANDLE_PERIOD)
 
             if candles:
                 try:
-                    candles_data = process_candles(candles, 5)
+                    candles_data = process_candles(candles, CANDLE_PERIOD)
                 except KeyError:
                     candles_data = [
                         {
@@ -66,6 +117,7 @@ async def get_live_candles_and_trade(client, assets):
                         }
                         for candle in candles
                     ]
+                latest_candles[asset] = candles_data
 
                 if len(candles_data) >= 10:
                     highs = [candle["high"] for candle in candles_data]
@@ -101,35 +153,40 @@ async def get_live_candles_and_trade(client, assets):
 
                     if direction:
                         logging.info(f"[{asset}] - Placing {direction.upper()} Trade")
-                        await execute_trade(client, asset, direction)
+                        task = asyncio.create_task(execute_trade(client, asset, direction))
+                        pending_trades.add(task)
+                        task.add_done_callback(pending_trades.discard)
 
             await asyncio.sleep(2)  # Short delay before checking the next asset
 
+        # One pass covers every asset, so feed the newly closed candles to the correlations
+        correlations.update_from_matrix(PriceMatrix({asset: latest_candles.get(asset) for asset in ASSETS},
+                                                    CANDLE_PERIOD))
+
 async def execute_trade(client, asset, direction):
-    """Execute a trade and prevent new trades until it finishes."""
-    global global_trade_active
-    stake = 1  
-    duration = 5
+    """Reserve exposure, execute a trade and release it once the trade settles."""
+    stake = STAKE
+    duration = DURATION
 
-    async with asyncio.Lock():  
-        if global_trade_active:
-            logging.info(f"[{asset}] - Trade already active, skipping.")
-            return
+    position_id = await position_manager.open(asset, stake)
+    if position_id is None:
+        return
 
+    try:
         logging.info(f"[{asset}] - Attempting trade | Direction: {direction.upper()} | Stake: {stake}")
         status, buy_info = await client.buy(stake, asset, direction, duration)
 
         if status:
             logging.info(f"[{asset}] - Trade Successful! Direction: {direction.upper()} | Info: {buy_info}")
-            global_trade_active = True  
-            await track_trade_result(client, buy_info["id"], duration)  
+            await track_trade_result(client, buy_info["id"], duration)
         else:
             logging.error(f"[{asset}] - Trade Failed! Error: {buy_info}")
-            global_trade_active = False  
+    finally:
+        await position_manager.close(position_id)
+        logging.info(position_manager.summary())
 
 async def track_trade_result(client, trade_id, duration):
-    """Wait for trade result, then allow the next trade."""
-    global global_trade_active
+    """Wait for trade result."""
     timeout = time.time() + duration + 5  
 
     logging.info(f"Tracking trade result for Trade ID: {trade_id}")
@@ -142,18 +199,25 @@ async def track_trade_result(client, trade_id, duration):
             logging.info(f"Trade ID {trade_id} Result: {'Win' if result > 0 else 'Loss'} | Payout: {result}")
             break  
 
-    global_trade_active = False  
-    logging.info("Trade completed. Ready for next trade.")
+    logging.info(f"Trade ID {trade_id} completed.")
 
 async def main():
+    try:
+        config = ConfigWatcher(required=REQUIRED_KEYS)
+        read_settings(config.config)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logging.error(f"❌ Cannot start without a valid config: {e}")
+        return
+    apply_config(config.config)
+    config.on_change(apply_config, validate=read_settings)
+    watcher = asyncio.create_task(config.watch())
+
     client = Quotex(email, password)
     connected, message = await client.connect()
 
     if connected:
         logging.info("Connected to Quotex API")
-        assets = ["BRLUSD_otc", "GBPJPY_otc", "USDINR_otc", "NZDUSD_otc"]
-
-        await get_live_candles_and_trade(client, assets)  
+        await get_live_candles_and_trade(client)
     else:
         logging.error(f"Failed to connect: {message}")
 
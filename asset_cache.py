@@ -0,0 +1,98 @@
+import logging
+import time
+
+ASSET_CACHE_TTL = 300  # Seconds between full instrument refreshes
+RETRY_DELAY = 5  # First wait after a failed refresh; doubles on each failure up to the TTL
+
+# Column positions in the broker's instrument rows
+SYMBOL_INDEX = 1
+NAME_INDEX = 2
+PAYOUT_INDEX = 5
+OPEN_INDEX = 14
+
+
+class AssetCache:
+    """Payout and open/closed status for every asset, refreshed in bulk on a TTL."""
+
+    def __init__(self, ttl=ASSET_CACHE_TTL):
+        self.ttl = ttl
+        self.assets = {}  # symbol -> {"name", "payout", "open", "updated"}
+        self.last_refresh = 0
+        self.retry_at = 0
+        self.failures = 0
+
+    def _parse(self, instrument, now):
+        return instrument[SYMBOL_INDEX], {
+            "name": str(instrument[NAME_INDEX]).replace("\n", ""),
+            "payout": float(instrument[PAYOUT_INDEX] or 0),
+            "open": bool(instrument[OPEN_INDEX]),
+            "updated": now,
+        }
+
+    async def refresh(self, client):
+        """Fetches all instruments in one call and rebuilds the table."""
+        try:
+            instruments = await client.get_instruments()
+        except Exception as e:
+            logging.error(f"❌ Asset cache refresh failed: {e}")
+            self._back_off()
+            return False
+        if not instruments:
+            logging.warning("⚠️ Asset cache refresh returned no instruments.")
+            self._back_off()
+            return False
+
+        now = time.time()
+        self.failures = 0
+        assets = {}
+        for instrument in instruments:
+            try:
+                symbol, info = self._parse(instrument, now)
+            except (IndexError, TypeError, ValueError):
+                continue
+            assets[symbol] = info
+        self.assets = assets
+        self.last_refresh = now
+        open_count = sum(1 for info in assets.values() if info["open"])
+        logging.info(f"📋 Asset cache refreshed: {len(assets)} assets, {open_count} open")
+        return True
+
+    def _back_off(self):
+        # Keep the old table and wait before asking again instead of retrying every cycle
+        delay = min(RETRY_DELAY * 2 ** self.failures, self.ttl)
+        self.failures += 1
+        self.retry_at = time.time() + delay
+        logging.info(f"📋 Next asset cache refresh in {delay:.0f}s")
+
+    async def maybe_refresh(self, client):
+        now = time.time()
+        if now - self.last_refresh >= self.ttl and now >= self.retry_at:
+            await self.refresh(client)
+
+    def update(self, asset, payout=None, is_open=None):
+        """Applies a pushed payout/status change without waiting for the TTL."""
+        # An asset first heard of through a push is treated as open until a refresh says otherwise
+        info = self.assets.setdefault(asset, {"name": asset, "payout": 0.0, "open": True, "updated": 0})
+        if payout is not None:
+            info["payout"] = float(payout)
+        if is_open is not None:
+            info["open"] = bool(is_open)
+        info["updated"] = time.time()
+
+    def payout(self, asset):
+        info = self.assets.get(asset)
+        return info["payout"] if info else None
+
+    def is_open(self, asset):
+        info = self.assets.get(asset)
+        return info["open"] if info else None
+
+    def is_tradeable(self, asset, min_payout=0):
+        """False if the asset is known to be closed or pays below min_payout.
+
+        Unknown assets pass, so an empty or failed cache never stops the scanner.
+        """
+        info = self.assets.get(asset)
+        if info is None:
+            return True
+        return info["open"] and info["payout"] >= min_payout
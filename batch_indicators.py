@@ -0,0 +1,146 @@
+import numpy as np
+
+# Same defaults as the per-asset functions in the bots
+SHORT_TERM_PERIOD = 5
+LONG_TERM_PERIOD = 20
+RSI_PERIOD = 14
+VOLATILITY_WINDOW = 5
+CANDLE_PERIOD = 60
+
+
+def _forward_fill(matrix):
+    """Carries the last known value over gaps along the time axis."""
+    valid = ~np.isnan(matrix)
+    index = np.where(valid, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], index]
+    # Leading gaps (before an asset's first candle) stay NaN
+    filled[np.cumsum(valid, axis=1) == 0] = np.nan
+    return filled
+
+
+def _nanmean_last(matrix, window):
+    tail = matrix[:, -window:]
+    count = np.sum(~np.isnan(tail), axis=1)
+    total = np.nansum(tail, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+class PriceMatrix:
+    """Open/high/low/close for many assets aligned on one assets-by-time grid."""
+
+    def __init__(self, candles_by_asset, period=CANDLE_PERIOD):
+        self.assets = [asset for asset, candles in candles_by_asset.items() if candles]
+        self.index = {asset: i for i, asset in enumerate(self.assets)}
+        self.period = period
+
+        if not self.assets:
+            self.times = np.empty(0)
+            self.lag = np.empty(0, dtype=int)
+            self.open = self.high = self.low = self.close = self.aligned_close = np.empty((0, 0))
+            self.closed_columns = 0
+            return
+
+        last_time = max(int(candles_by_asset[a][-1]["time"]) for a in self.assets)
+        first_time = min(int(candles_by_asset[a][0]["time"]) for a in self.assets)
+        last_slot = last_time - last_time % period
+        width = (last_slot - (first_time - first_time % period)) // period + 1
+        self.times = last_slot - period * np.arange(width - 1, -1, -1)
+
+        shape = (len(self.assets), width)
+        fields = {name: np.full(shape, np.nan) for name in ("open", "high", "low", "close")}
+        for row, asset in enumerate(self.assets):
+            candles = candles_by_asset[asset]
+            times = np.fromiter((int(c["time"]) for c in candles), dtype=np.int64, count=len(candles))
+            columns = width - 1 - (last_slot - (times - times % period)) // period
+            for name, matrix in fields.items():
+                matrix[row, columns] = np.fromiter((c[name] for c in candles), dtype=float, count=len(candles))
+
+        # An asset fetched just before a candle boundary ends one slot early; shift its row so
+        # column -1 is always that asset's latest candle instead of a stale copy of it
+        valid = ~np.isnan(fields["close"])
+        self.lag = np.argmax(valid[:, ::-1], axis=1)
+
+        # Cross-asset work (correlations) needs the unshifted grid, where column j is the same
+        # minute for every asset, and only candles that have closed for every asset
+        self.aligned_close = _forward_fill(fields["close"])
+        self.closed_columns = int(np.sum(self.times < self.times[width - 1 - self.lag].min()))
+        source = np.arange(width) - self.lag[:, None]
+        rows = np.arange(len(self.assets))[:, None]
+        for name, matrix in fields.items():
+            shifted = matrix[rows, np.maximum(source, 0)]
+            shifted[source < 0] = np.nan
+            fields[name] = _forward_fill(shifted)
+
+        self.open, self.high, self.low, self.close = (fields[n] for n in ("open", "high", "low", "close"))
+
+
+def compute_indicators(prices, short_term_period=SHORT_TERM_PERIOD, long_term_period=LONG_TERM_PERIOD,
+                       rsi_period=RSI_PERIOD):
+    """Computes trend, RSI, volatility and candle patterns for every asset in one pass.
+
+    Trend compares the short and long moving averages of close, volatility the
+    average range and body of the last few candles, and the doji and pattern
+    flags look at each asset's latest one or two candles.
+    """
+    o, h, l, c = prices.open, prices.high, prices.low, prices.close
+    if not prices.assets or c.shape[1] < 3:
+        return BatchIndicators(prices, {})
+
+    short_ma = _nanmean_last(c, short_term_period)
+    long_ma = _nanmean_last(c, long_term_period)
+    trend = np.where(short_ma > long_ma, "Bullish", np.where(short_ma < long_ma, "Bearish", "Sideways"))
+
+    change = np.diff(c, axis=1)
+    avg_gain = _nanmean_last(np.where(np.isnan(change), np.nan, np.maximum(change, 0)), rsi_period)
+    avg_loss = _nanmean_last(np.where(np.isnan(change), np.nan, -np.minimum(change, 0)), rsi_period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+    body = np.abs(c - o)
+    candle_range = h - l
+    atr = _nanmean_last(candle_range, rsi_period)
+    has_window = np.sum(~np.isnan(c[:, -VOLATILITY_WINDOW:]), axis=1) >= VOLATILITY_WINDOW
+    volatile = has_window & (_nanmean_last(candle_range, VOLATILITY_WINDOW) > 2 * _nanmean_last(body, VOLATILITY_WINDOW))
+
+    c1, o1, c2, o2 = c[:, -1], o[:, -1], c[:, -2], o[:, -2]
+    body1 = body[:, -1]
+    lower_wick = l[:, -1] - np.minimum(c1, o1)
+    upper_wick = h[:, -1] - np.maximum(c1, o1)
+    green = c > o
+    red = c < o
+
+    results = {
+        "trend": trend,
+        "short_ma": short_ma,
+        "long_ma": long_ma,
+        "rsi": rsi,
+        "atr": atr,
+        "volatile": volatile,
+        "doji": body1 < 0.1 * candle_range[:, -1],
+        "three_green": np.all(green[:, -3:], axis=1),
+        "three_red": np.all(red[:, -3:], axis=1),
+        "bullish_engulfing": (c2 < o2) & (c1 > o1) & (c1 > o2) & (o1 < c2),
+        "bearish_engulfing": (c2 > o2) & (c1 < o1) & (c1 < o2) & (o1 > c2),
+        "bullish_harami": (c2 > o2) & (c1 < o1) & (c1 > o2) & (o1 < c2),
+        "bearish_harami": (c2 < o2) & (c1 > o1) & (c1 < o2) & (o1 > c2),
+        "bullish_pin_bar": (lower_wick > 2 * body1) & (upper_wick < body1) & (c1 > o1),
+        "bearish_pin_bar": (upper_wick > 2 * body1) & (lower_wick < body1) & (c1 < o1),
+    }
+    return BatchIndicators(prices, results)
+
+
+class BatchIndicators:
+    """Per-asset view over the arrays produced by compute_indicators."""
+
+    def __init__(self, prices, results):
+        self.prices = prices
+        self.results = results
+
+    def __contains__(self, asset):
+        return bool(self.results) and asset in self.prices.index
+
+    def for_asset(self, asset):
+        row = self.prices.index[asset]
+        return {name: values[row].item() for name, values in self.results.items()}
@@ -0,0 +1,139 @@
+import asyncio
+import copy
+import json
+import logging
+import os
+
+DEFAULT_CONFIG_PATH = os.environ.get("BOT_CONFIG", "bot_config.json")
+
+# trial.py's money settings have no safe default; the file must set them explicitly.
+# Other bots pass their own list ("section.key" for nested settings).
+REQUIRED_KEYS = ["assets", "initial_stake", "target_profit", "stop_loss"]
+
+# Defaults used for any other key missing from the config file
+DEFAULT_CONFIG = {
+    "martingale": {"factor": 2, "max_stages": 2},
+    "filters": {"volatility": True, "doji": True, "three_opposite": True},
+    "patterns": ["engulfing", "harami", "pin_bar"],
+    "pipeline": {"auto_reorder": True, "report_every": 50},
+    "correlation": {"enabled": True, "window": 60, "threshold": 0.8},
+    "positions": {"max_open_trades": 3, "max_trades_per_asset": 1, "max_currency_exposure": 5, "max_total_exposure": 10},
+    "min_payout": 0,
+    "time_filter": {"enabled": False, "sessions": [], "blackouts": [], "assets": {}},
+    "asset_cache_ttl": 300,
+    "scan_delay": 1,
+    "paper": {"enabled": False, "balance": 1000, "target_profit": 1100, "stop_loss": 900, "latency": "auto",
+              "variants": {},
+              "trace_file": "paper_traces.jsonl", "checkpoint_file": "paper_session_state.json"},
+    "candle_requests": {"rate": 5, "burst": 10, "cache_ttl": 2},
+    "fetch_concurrency": 8,
+    "record_dir": None,
+    "replay": {"dir": None, "speed": 1000},
+    "trace_file": "trade_traces.jsonl",
+    "checkpoint_file": "session_state.json",
+    "resume": True,
+    "profiler": {"enabled": False, "duration": 30, "interval": 0.005, "slow_callback_ms": 50, "output_dir": "profiles"},
+    "reload_interval": 2,
+    "fibo": {"duration": 5},
+}
+
+
+def _merge(defaults, overrides):
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _has_key(config, dotted_key):
+    for key in dotted_key.split("."):
+        if not isinstance(config, dict) or key not in config:
+            return False
+        config = config[key]
+    return True
+
+
+def load_config(path=DEFAULT_CONFIG_PATH, required=REQUIRED_KEYS):
+    """Reads the JSON config file and fills in defaults. Raises ValueError if a required key is missing."""
+    with open(path) as f:
+        overrides = json.load(f)
+    missing = [key for key in required if not _has_key(overrides, key)]
+    if missing:
+        raise ValueError(f"{path} is missing required settings: {', '.join(missing)}")
+    return _merge(DEFAULT_CONFIG, overrides)
+
+
+class ConfigWatcher:
+    """Holds the live config and re-reads the file whenever it changes on disk.
+
+    A missing or invalid file at startup raises, so the bot never trades on guessed limits.
+    A reload is only swapped in once every registered validator accepts it.
+    """
+
+    def __init__(self, path=DEFAULT_CONFIG_PATH, required=REQUIRED_KEYS):
+        self.path = path
+        self.required = required
+        self.callbacks = []
+        self.validators = []
+        self._mtime = os.stat(path).st_mtime
+        self.config = load_config(path, required)
+        logging.info(f"🔄 Config loaded from {path}")
+
+    def __getitem__(self, key):
+        return self.config[key]
+
+    def get(self, key, default=None):
+        return self.config.get(key, default)
+
+    def on_change(self, callback, validate=None):
+        """Registers callback(config), called after every successful reload.
+
+        validate(config) runs on each candidate first and should build whatever
+        the callback derives from it, raising if any of it is invalid.
+        """
+        self.callbacks.append(callback)
+        if validate is not None:
+            self.validators.append(validate)
+
+    def reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+        # Each version of the file is tried once; a rejected one waits for the next edit
+        self._mtime = mtime
+
+        try:
+            new_config = load_config(self.path, self.required)
+            for validate in self.validators:
+                validate(new_config)
+        except Exception as e:
+            # Keep trading on the last good config if the file is mid-edit or invalid
+            logging.error(f"❌ Could not reload config {self.path}, keeping the previous one: {e}")
+            return False
+
+        # Update in place so anything holding a reference sees the new values
+        self.config.clear()
+        self.config.update(new_config)
+        logging.info(f"🔄 Config loaded from {self.path}")
+        for callback in self.callbacks:
+            try:
+                callback(self.config)
+            except Exception:
+                logging.exception(f"❌ Applying the config from {self.path} failed")
+        return True
+
+    async def watch(self):
+        """Polls the config file; run it as a background task next to the trading loop."""
+        while True:
+            await asyncio.sleep(self.config.get("reload_interval", 2))
+            try:
+                self.reload_if_changed()
+            except Exception:
+                # The watcher must outlive any single bad reload
+                logging.exception(f"❌ Config reload from {self.path} failed")
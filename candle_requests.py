@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+
+REQUESTS_PER_SECOND = 5  # Sustained get_candles rate across the connection
+BURST = 10  # Requests allowed back to back before throttling kicks in
+CACHE_TTL = 2  # Seconds a response is reused, never past the end of its candle period
+MAX_CACHE_ENTRIES = 256  # Expired entries are dropped once the cache grows past this
+HISTORY_SECONDS = 10800  # Three hours of 1-minute candles per asset
+CANDLE_PERIOD = 60
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CandleRequestLayer:
+    """Wraps a client so identical get_candles calls share one network request.
+
+    Concurrent callers asking for the same (asset, offset, period) in the same
+    candle period wait on a single in-flight request, later ones within
+    `cache_ttl` get the cached response, and every real request first takes a
+    token from a bucket shared by the whole connection.
+    """
+
+    def __init__(self, client, rate=REQUESTS_PER_SECOND, burst=BURST, cache_ttl=CACHE_TTL):
+        self._client = client
+        self.bucket = TokenBucket(rate, burst)
+        self.cache_ttl = cache_ttl
+        self.cache = {}  # key -> (expires_at, candles)
+        self.inflight = {}  # key -> task
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "network": 0}
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    async def get_candles(self, asset, end_time, offset, period):
+        self.stats["requests"] += 1
+        now = time.time()
+        key = (asset, offset, period, int(end_time) // period)
+
+        cached = self.cache.get(key)
+        if cached and now < cached[0]:
+            self.stats["cache_hits"] += 1
+            return cached[1]
+
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, asset, end_time, offset, period))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        # Shield so one cancelled caller doesn't cancel the request for everyone else
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key, asset, end_time, offset, period):
+        await self.bucket.acquire()
+        self.stats["network"] += 1
+        candles = await self._client.get_candles(asset, end_time, offset, period)
+
+        received = time.time()
+        period_end = (int(received) // period + 1) * period
+        if candles:
+            self.cache[key] = (min(received + self.cache_ttl, period_end), candles)
+        if len(self.cache) > MAX_CACHE_ENTRIES:
+            self._evict(received)
+        return candles
+
+    def _evict(self, now):
+        for key in [k for k, (expires, _) in self.cache.items() if expires <= now]:
+            del self.cache[key]
+
+    def summary(self):
+        s = self.stats
+        return (f"📡 Candle requests: {s['requests']} | Network: {s['network']} | "
+                f"Cache hits: {s['cache_hits']} | Coalesced: {s['coalesced']}")
+
+
+async def fetch_candles(client, asset, now, offset=HISTORY_SECONDS, period=CANDLE_PERIOD):
+    """One asset's candles, or None if the request failed."""
+    try:
+        candles = await client.get_candles(asset, int(now), offset, period)
+    except Exception as e:
+        logging.error(f"Error fetching candles for {asset}: {e}")
+        return None
+    if not candles:
+        logging.warning(f"No candles available for {asset}.")
+    return candles
+
+
+async def fetch_all_candles(client, assets, concurrency, clock):
+    """Fetches every asset at once, at most `concurrency` in flight.
+
+    Returns ({asset: candles or None}, {asset: receive time on `clock`}).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    received_at = {}
+
+    async def fetch(asset):
+        async with semaphore:
+            candles = await fetch_candles(client, asset, clock.time())
+            received_at[asset] = clock.time()
+            return candles
+
+    results = await asyncio.gather(*(fetch(asset) for asset in assets))
+    return dict(zip(assets, results)), received_at
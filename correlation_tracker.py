@@ -0,0 +1,124 @@
+from collections import deque
+
+import numpy as np
+
+CORRELATION_WINDOW = 60  # Candles of returns kept per asset
+CORRELATION_THRESHOLD = 0.8
+
+
+class CorrelationTracker:
+    """Rolling return correlations between assets, updated one candle at a time.
+
+    Keeps running sums of returns and of their pairwise products over the
+    window, so each new candle costs one outer product instead of a full
+    recomputation.
+    """
+
+    def __init__(self, window=CORRELATION_WINDOW, threshold=CORRELATION_THRESHOLD):
+        self.window = window
+        self.threshold = threshold
+        self.reset([])
+
+    def reset(self, assets):
+        self.assets = list(assets)
+        self.index = {asset: i for i, asset in enumerate(self.assets)}
+        size = len(self.assets)
+        self.returns = deque()
+        self.sums = np.zeros(size)
+        self.products = np.zeros((size, size))
+        self.last_time = None
+        self._updates = 0
+        self._corr = None
+        self._clusters = None
+
+    def update(self, timestamp, returns):
+        """Adds one aligned vector of returns (ordered like self.assets)."""
+        if self.last_time is not None and timestamp <= self.last_time:
+            return
+        self.last_time = timestamp
+        returns = np.asarray(returns, dtype=float)
+        self.returns.append(returns)
+        self.sums += returns
+        self.products += np.outer(returns, returns)
+        if len(self.returns) > self.window:
+            oldest = self.returns.popleft()
+            self.sums -= oldest
+            self.products -= np.outer(oldest, oldest)
+
+        # Recompute from the window now and then so float error cannot accumulate
+        self._updates += 1
+        if self._updates % self.window == 0:
+            stacked = np.array(self.returns)
+            self.sums = stacked.sum(axis=0)
+            self.products = stacked.T @ stacked
+        self._corr = None
+        self._clusters = None
+
+    def update_from_matrix(self, prices):
+        """Feeds any closed candles newer than the last update from a batch_indicators.PriceMatrix."""
+        if prices.assets != self.assets:
+            self.reset(prices.assets)
+        close = prices.aligned_close[:, :prices.closed_columns]
+        if close.shape[1] < 2:
+            return
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = np.nan_to_num(close[:, 1:] / close[:, :-1] - 1, nan=0.0, posinf=0.0, neginf=0.0)
+        times = prices.times[1:prices.closed_columns]
+        new_columns = np.nonzero(times > self.last_time)[0] if self.last_time is not None else np.arange(len(times))
+        for column in new_columns[-self.window:]:
+            self.update(times[column], returns[:, column])
+
+    def correlation_matrix(self):
+        if self._corr is None:
+            count = len(self.returns)
+            if count < 2:
+                self._corr = np.zeros((len(self.assets), len(self.assets)))
+                return self._corr
+            mean = self.sums / count
+            cov = self.products / count - np.outer(mean, mean)
+            std = np.sqrt(np.clip(np.diag(cov), 0, None))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                corr = cov / np.outer(std, std)
+            self._corr = np.nan_to_num(np.clip(corr, -1, 1))
+        return self._corr
+
+    def correlation(self, asset, other):
+        if asset not in self.index or other not in self.index:
+            return 0.0
+        return float(self.correlation_matrix()[self.index[asset], self.index[other]])
+
+    def max_correlation(self, asset, others):
+        """Highest correlation between asset and any of the others (0 if none)."""
+        return max((self.correlation(asset, other) for other in others if other != asset), default=0.0)
+
+    def clusters(self, threshold=None):
+        """Groups of assets linked by correlation at or above the threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        corr = self.correlation_matrix()
+        parent = list(range(len(self.assets)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        rows, columns = np.nonzero(np.triu(corr >= threshold, k=1))
+        for i, j in zip(rows, columns):
+            parent[find(i)] = find(j)
+
+        groups = {}
+        for i, asset in enumerate(self.assets):
+            groups.setdefault(find(i), []).append(asset)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def cluster_of(self, asset, threshold=None):
+        """The asset's correlation cluster, itself included; cached until the next update."""
+        threshold = self.threshold if threshold is None else threshold
+        if self._clusters is None or self._clusters[0] != threshold:
+            membership = {}
+            for group in self.clusters(threshold):
+                members = frozenset(group)
+                membership.update(dict.fromkeys(group, members))
+            self._clusters = (threshold, membership)
+        return self._clusters[1].get(asset, frozenset([asset]))
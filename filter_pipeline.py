@@ -0,0 +1,109 @@
+import time
+from contextlib import contextmanager
+
+MIN_CALLS_BEFORE_REORDER = 50  # Stats per stage needed before trusting them for ordering
+
+
+class Stage:
+    """One filter: func(ctx) returns None to pass, or a reason string ("" for a silent reject)."""
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.calls = 0
+        self.rejects = 0
+        self.total_ns = 0
+
+    @property
+    def reject_rate(self):
+        return self.rejects / self.calls if self.calls else 0.0
+
+    @property
+    def avg_ns(self):
+        return self.total_ns / self.calls if self.calls else 0.0
+
+    def rank(self):
+        # Expected cost per rejection: cheap and selective stages sort first
+        if not self.rejects:
+            return float("inf")
+        return self.avg_ns / self.reject_rate
+
+
+class FilterPipeline:
+    """Runs stages in order, stops at the first rejection and keeps per-stage cost stats.
+
+    All stages must be independent pass/fail checks, so reordering them only
+    changes which reason is reported, never whether a signal passes.
+    """
+
+    def __init__(self, stages, auto_reorder=False, reorder_every=200):
+        self.stages = list(stages)
+        self.auto_reorder = auto_reorder
+        self.reorder_every = reorder_every
+        self.runs = 0
+        self.passes = 0
+
+    def run(self, ctx):
+        """Returns None if every stage passed, otherwise the rejecting stage's reason."""
+        self.runs += 1
+        for stage in self.stages:
+            start = time.perf_counter_ns()
+            reason = stage.func(ctx)
+            stage.total_ns += time.perf_counter_ns() - start
+            stage.calls += 1
+            if reason is not None:
+                stage.rejects += 1
+                self._maybe_reorder()
+                return reason
+        self.passes += 1
+        self._maybe_reorder()
+        return None
+
+    def _maybe_reorder(self):
+        if self.auto_reorder and self.runs % self.reorder_every == 0:
+            self.reorder()
+
+    def reorder(self):
+        if all(stage.calls >= MIN_CALLS_BEFORE_REORDER for stage in self.stages):
+            self.stages.sort(key=Stage.rank)
+
+    def report(self):
+        total_ns = sum(stage.total_ns for stage in self.stages) or 1
+        lines = [f"🔎 Filter pipeline: {self.runs} runs, {self.passes} passed"
+                 f"{' (auto-reordered)' if self.auto_reorder else ''}",
+                 f"  {'stage':<16}{'calls':>8}{'reject %':>10}{'avg µs':>10}{'total ms':>10}{'time %':>8}"]
+        for stage in self.stages:
+            lines.append(f"  {stage.name:<16}{stage.calls:>8}{stage.reject_rate * 100:>10.1f}"
+                         f"{stage.avg_ns / 1000:>10.2f}{stage.total_ns / 1e6:>10.2f}{stage.total_ns / total_ns * 100:>8.1f}")
+        return "\n".join(lines)
+
+
+class PhaseTimer:
+    """Wall time per phase of the scan cycle.
+
+    The filter stages cost microseconds per asset; the fetch, price matrix,
+    indicator and correlation passes are where a cycle's time actually goes.
+    """
+
+    def __init__(self):
+        self.phases = {}  # name -> [calls, total_ns], in first-seen order
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, [0, 0])
+            entry[0] += 1
+            entry[1] += time.perf_counter_ns() - start
+
+    def report(self):
+        total_ns = sum(total for _, total in self.phases.values()) or 1
+        cycles = max((calls for calls, _ in self.phases.values()), default=0)
+        lines = [f"⏱️ Scan cycle: {cycles} cycles",
+                 f"  {'phase':<16}{'calls':>8}{'avg ms':>10}{'total ms':>10}{'time %':>8}"]
+        for name, (calls, total) in self.phases.items():
+            lines.append(f"  {name:<16}{calls:>8}{total / calls / 1e6:>10.2f}{total / 1e6:>10.2f}"
+                         f"{total / total_ns * 100:>8.1f}")
+        return "\n".join(lines)
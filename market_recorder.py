@@ -0,0 +1,245 @@
+import asyncio
+import bisect
+import glob
+import gzip
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+
+CHUNK_RECORDS = 5000  # Records per compressed chunk file
+CHUNK_SECONDS = 60  # A new chunk is started every minute, so a crash loses at most one
+FLUSH_INTERVAL = 5  # Seconds between flushes of the open chunk
+
+# Realtime client calls whose results are captured as "stream" entries
+STREAM_METHODS = ("get_realtime_candles", "get_realtime_price", "get_realtime_sentiment")
+
+
+class WallClock:
+    """Real time, with the same time()/sleep() interface ReplayClient offers for the recording's clock."""
+
+    @staticmethod
+    def time():
+        return time.time()
+
+    @staticmethod
+    async def sleep(seconds):
+        await asyncio.sleep(seconds)
+
+
+class MarketRecorder:
+    """Appends raw market data, with receive timestamps, to gzip'd JSON-lines chunks."""
+
+    def __init__(self, directory, chunk_records=CHUNK_RECORDS, chunk_seconds=CHUNK_SECONDS):
+        self.directory = directory
+        self.chunk_records = chunk_records
+        self.chunk_seconds = chunk_seconds
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.chunk_index = 0
+        self.count = 0
+        self.chunk_ends = 0
+        self.flushed = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_chunk(self, now):
+        path = os.path.join(self.directory, f"market-{self.session}-{self.chunk_index:05d}.jsonl.gz")
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self.chunk_index += 1
+        self.count = 0
+        self.chunk_ends = (now // self.chunk_seconds + 1) * self.chunk_seconds
+        self.flushed = now
+
+    def record(self, kind, payload, received=None, **fields):
+        now = time.time()
+        if self._file is not None and now >= self.chunk_ends:
+            self.close()
+        if self._file is None:
+            self._open_chunk(now)
+        entry = {"t": received if received is not None else now, "kind": kind, **fields, "data": payload}
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.count += 1
+        if self.count >= self.chunk_records:
+            self.close()
+        elif now - self.flushed >= FLUSH_INTERVAL:
+            # A sync flush makes everything written so far readable even if the process is killed
+            self._file.flush()
+            self.flushed = now
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordingClient:
+    """Wraps a Quotex client and records every get_candles response and realtime read."""
+
+    def __init__(self, client, recorder):
+        self._client = client
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in STREAM_METHODS:
+            return attr
+
+        async def recorded(asset, *args):
+            message = attr(asset, *args)
+            if inspect.isawaitable(message):
+                message = await message
+            self.recorder.record("stream", message, method=name, asset=asset, args=list(args))
+            return message
+        return recorded
+
+    async def get_candles(self, asset, end_time, offset, period):
+        candles = await self._client.get_candles(asset, end_time, offset, period)
+        self.recorder.record("candles", candles, asset=asset, end_time=end_time, offset=offset, period=period)
+        return candles
+
+    def record_stream(self, message, **fields):
+        """Call from a websocket/stream handler to capture pushed messages."""
+        self.recorder.record("stream", message, **fields)
+
+    def close(self):
+        self.recorder.close()
+        return self._client.close()
+
+
+def read_recording(directory):
+    """Yields recorded entries from every chunk in the directory, in order.
+
+    A chunk cut short by a crash is read up to its last complete line.
+    """
+    for path in sorted(glob.glob(os.path.join(directory, "market-*.jsonl.gz"))):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError) as e:
+            logging.warning(f"⚠️ {os.path.basename(path)} is truncated, using the records before the cut: {e}")
+
+
+class ReplayClient:
+    """Stands in for the Quotex client and serves a recording back on a simulated clock.
+
+    `time()` starts at the first recorded entry and only moves when the bot
+    calls `sleep()`; each read returns the newest response recorded at or
+    before that time. speed=1 makes sleeps take real time, speed=0 replays as
+    fast as possible. Orders are never sent; pair it with a PaperBroker.
+    """
+
+    def __init__(self, directory, speed=1000):
+        self.speed = speed
+        self.responses = {}  # (kind, asset, period or method) -> (times, entries), oldest first
+        self.prices = {}  # asset -> (times, closes) from every recorded candle response
+        self.stream_entries = []
+        self.recording_start = self.recording_end = None
+        for entry in read_recording(directory):
+            if entry["kind"] == "candles":
+                key = ("candles", entry["asset"], entry["period"])
+                if entry["data"]:
+                    times, closes = self.prices.setdefault(entry["asset"], ([], []))
+                    times.append(entry["t"])
+                    closes.append(entry["data"][-1]["close"])
+            elif entry["kind"] == "stream":
+                self.stream_entries.append(entry)
+                key = ("stream", entry.get("asset"), entry.get("method"))
+            else:
+                continue
+            times, entries = self.responses.setdefault(key, ([], []))
+            times.append(entry["t"])
+            entries.append(entry)
+            if self.recording_start is None:
+                self.recording_start = entry["t"]
+            self.recording_end = max(self.recording_end or entry["t"], entry["t"])
+        self.clock = self.recording_start or 0
+
+    def time(self):
+        """Current time on the recording's clock."""
+        return self.clock
+
+    async def sleep(self, seconds):
+        target = self.clock + max(seconds, 0)
+        await asyncio.sleep(seconds / self.speed if self.speed else 0)
+        # Concurrent sleepers each move the clock to their own wake-up time, never back
+        self.clock = max(self.clock, target)
+
+    def finished(self):
+        return self.recording_end is None or self.clock >= self.recording_end
+
+    def _latest(self, key):
+        times, entries = self.responses.get(key, ((), ()))
+        index = bisect.bisect_right(times, self.clock) - 1
+        return entries[index]["data"] if index >= 0 else None
+
+    def price_at(self, asset):
+        """Last recorded close for the asset at the current replay time."""
+        times, closes = self.prices.get(asset, ((), ()))
+        index = bisect.bisect_right(times, self.clock) - 1
+        return closes[index] if index >= 0 else None
+
+    def __getattr__(self, name):
+        if name not in STREAM_METHODS:
+            raise AttributeError(name)
+
+        async def replayed(asset, *args):
+            return self._latest(("stream", asset, name))
+        return replayed
+
+    async def connect(self):
+        return True, "Replaying recording"
+
+    async def get_balance(self):
+        return 0
+
+    async def get_instruments(self):
+        return []
+
+    async def get_candles(self, asset, end_time, offset, period):
+        await asyncio.sleep(0)
+        return self._latest(("candles", asset, period)) or []
+
+    async def stream(self):
+        for entry in self.stream_entries:
+            if entry["t"] > self.clock:
+                await self.sleep(entry["t"] - self.clock)
+            yield entry["data"]
+
+    async def buy(self, amount, asset, direction, duration):
+        logging.info(f"[{asset}] - Replay mode: {direction.upper()} order for {amount} not sent")
+        return False, "Replay mode"
+
+    async def check_win(self, trade_id):
+        return None
+
+    def close(self):
+        pass
+
+
+# Usage: python market_recorder.py <recording_dir>
+def summarize(directory):
+    start = time.perf_counter()
+    count = 0
+    size = 0
+    assets = set()
+    first = last = None
+    for entry in read_recording(directory):
+        count += 1
+        size += len(json.dumps(entry["data"]))
+        assets.add(entry.get("asset"))
+        first = entry["t"] if first is None else first
+        last = entry["t"]
+    elapsed = time.perf_counter() - start
+    assets.discard(None)
+    span = (last - first) if count else 0
+    print(f"Records: {count} | Assets: {len(assets)} | Span: {span:.0f}s | Raw payload: {size / 1e6:.1f} MB")
+    print(f"Decoded in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    summarize(sys.argv[1] if len(sys.argv) > 1 else "recordings")
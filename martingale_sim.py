@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+SIMULATIONS = 1_000_000
+MAX_TRADES = 500
+DEFAULT_PAYOUT = 0.8
+
+
+def empirical_win_rate(trace_file):
+    """Win rate from settled trades in a trade_traces.jsonl file (dojis ignored)."""
+    wins = losses = 0
+    with open(trace_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            outcome = json.loads(line).get("outcome")
+            wins += outcome == "win"
+            losses += outcome == "loss"
+    if not wins + losses:
+        raise ValueError(f"No settled trades in {trace_file}")
+    return wins / (wins + losses), wins + losses
+
+
+def empirical_payout(trace_file):
+    """Mean payout (profit per unit staked) quoted on the trades in a trace file, or None if none recorded one."""
+    payouts = []
+    with open(trace_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            payout = json.loads(line).get("payout")
+            if payout:
+                payouts.append(payout)
+    if not payouts:
+        return None
+    return sum(payouts) / len(payouts), len(payouts)
+
+
+def simulate(balance, stake, win_rate, payout, factor=2, max_stages=2, target=None, stop_loss=0,
+             max_trades=MAX_TRADES, simulations=SIMULATIONS, seed=None):
+    """Runs many martingale sequences side by side as NumPy arrays.
+
+    Sizing follows trial.py: after a loss the stake is multiplied by `factor`
+    while the stage is <= max_stages (None means no cap, like the streak bot),
+    and it resets to `stake` after a win or once the cap is passed. `target`
+    and `stop_loss` are balance levels; a run is also ruined when it cannot
+    fund its next stake. `payout` is profit per unit staked on a win (0.85 = 85%).
+    """
+    rng = np.random.default_rng(seed)
+    balances = np.full(simulations, float(balance))
+    max_drawdown = np.zeros(simulations)
+    ruined = np.zeros(simulations, dtype=bool)
+    reached = np.zeros(simulations, dtype=bool)
+    finished_at = np.full(simulations, max_trades, dtype=np.int32)
+
+    # Lanes step in place with plain whole-array ops; a finished run's results are copied out
+    # when it stops and its lane is masked off. The lanes are only compacted once half of them
+    # are dead, instead of gathering and scattering every array on every trade.
+    runs = np.arange(simulations)
+    b = balances.copy()
+    s = np.full(simulations, float(stake))
+    st = np.zeros(simulations, dtype=np.int32)
+    peak = b.copy()
+    drawdown = np.zeros(simulations)
+    alive = np.ones(simulations, dtype=bool)
+    alive_count = simulations
+    for trade in range(1, max_trades + 1):
+        if not alive_count:
+            break
+        won = rng.random(runs.size, dtype=np.float32) < win_rate
+        b += np.where(won, s * payout, -s)
+        escalate = ~won if max_stages is None else ~won & (st <= max_stages)
+        s = np.where(escalate, s * factor, float(stake))
+        st += 1
+        st *= escalate
+        np.maximum(peak, b, out=peak)
+        np.maximum(drawdown, peak - b, out=drawdown)
+
+        broke = (b < s) | (b <= stop_loss)
+        stopped = broke | (b >= target) if target else broke
+        stopped &= alive
+        if not stopped.any():
+            continue
+        lanes = np.flatnonzero(stopped)
+        finished = runs[lanes]
+        balances[finished] = b[lanes]
+        max_drawdown[finished] = drawdown[lanes]
+        finished_at[finished] = trade
+        ruined[finished] = broke[lanes]
+        reached[finished] = ~broke[lanes]
+        alive &= ~stopped
+        alive_count -= lanes.size
+        if alive_count * 2 < runs.size:
+            runs, b, s, st, peak, drawdown = (array[alive] for array in (runs, b, s, st, peak, drawdown))
+            alive = np.ones(runs.size, dtype=bool)
+
+    # Runs still going after max_trades end where they are
+    balances[runs[alive]] = b[alive]
+    max_drawdown[runs[alive]] = drawdown[alive]
+
+    return {
+        "simulations": simulations,
+        "risk_of_ruin": ruined.mean(),
+        "prob_target": reached.mean(),
+        "prob_unfinished": 1 - ruined.mean() - reached.mean(),
+        "trades_to_target": np.percentile(finished_at[reached], [50, 90, 99]) if reached.any() else None,
+        "trades_to_ruin": np.percentile(finished_at[ruined], [50, 90, 99]) if ruined.any() else None,
+        "max_drawdown": np.percentile(max_drawdown, [50, 90, 95, 99]),
+        "final_balance": np.percentile(balances, [5, 50, 95]),
+    }
+
+
+def print_report(result):
+    print(f"Simulations:        {result['simulations']:,}")
+    print(f"Risk of ruin:       {result['risk_of_ruin']:.2%}")
+    print(f"Reached target:     {result['prob_target']:.2%}")
+    print(f"Still running:      {result['prob_unfinished']:.2%}")
+    if result["trades_to_target"] is not None:
+        print("Trades to target:   p50 {:.0f} | p90 {:.0f} | p99 {:.0f}".format(*result["trades_to_target"]))
+    if result["trades_to_ruin"] is not None:
+        print("Trades to ruin:     p50 {:.0f} | p90 {:.0f} | p99 {:.0f}".format(*result["trades_to_ruin"]))
+    print("Max drawdown:       p50 {:.2f} | p90 {:.2f} | p95 {:.2f} | p99 {:.2f}".format(*result["max_drawdown"]))
+    print("Final balance:      p5 {:.2f} | p50 {:.2f} | p95 {:.2f}".format(*result["final_balance"]))
+
+
+# Usage: python martingale_sim.py --balance 1000 --stake 1 --target 1100 --win-rate 0.55
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo risk of ruin for martingale sizing")
+    parser.add_argument("--balance", type=float, required=True)
+    parser.add_argument("--stake", type=float, required=True)
+    parser.add_argument("--target", type=float, help="Balance at which a run stops as a success")
+    parser.add_argument("--stop-loss", type=float, default=0, help="Balance at which a run counts as ruined")
+    parser.add_argument("--win-rate", type=float, help="Defaults to the win rate in --history")
+    parser.add_argument("--history", default="trade_traces.jsonl", help="Trade trace file for the empirical win rate")
+    parser.add_argument("--payout", type=float,
+                        help=f"Defaults to the mean payout in --history, or {DEFAULT_PAYOUT} if it has none")
+    parser.add_argument("--factor", type=float, default=2)
+    parser.add_argument("--max-stages", type=int, default=2, help="-1 for unlimited doubling")
+    parser.add_argument("--trades", type=int, default=MAX_TRADES)
+    parser.add_argument("--simulations", type=int, default=SIMULATIONS)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    win_rate = args.win_rate
+    if win_rate is None:
+        try:
+            win_rate, sample = empirical_win_rate(args.history)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read a win rate from --history {args.history} ({e}); pass --win-rate")
+        print(f"Empirical win rate: {win_rate:.2%} over {sample} trades")
+
+    payout = args.payout
+    if payout is None:
+        try:
+            # With --win-rate given, a missing history just means no recorded payouts
+            history = empirical_payout(args.history) if os.path.exists(args.history) else None
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read payouts from --history {args.history} ({e}); pass --payout")
+        if history:
+            payout, sample = history
+            print(f"Empirical payout:   {payout:.1%} over {sample} trades")
+        else:
+            payout = DEFAULT_PAYOUT
+            print(f"No payouts in {args.history}; assuming {payout:.0%}")
+
+    start = time.perf_counter()
+    result = simulate(args.balance, args.stake, win_rate, payout, args.factor,
+                      None if args.max_stages < 0 else args.max_stages, args.target, args.stop_loss,
+                      args.trades, args.simulations, args.seed)
+    print_report(result)
+    print(f"Simulated in {time.perf_counter() - start:.2f}s")
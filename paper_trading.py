@@ -0,0 +1,136 @@
+import itertools
+import logging
+import os
+
+from market_recorder import WallClock
+from trade_trace import summarize
+
+PAPER_BALANCE = 1000
+ORDER_LATENCY = 0.3  # Seconds from order submission to broker acknowledgement
+DEFAULT_PAYOUT = 0.8
+
+
+def measured_order_latency(trace_file, default=ORDER_LATENCY):
+    """Median submit-to-acknowledge time from live trade traces, if there are any."""
+    if not os.path.exists(trace_file):
+        return default
+    stats = summarize(trace_file).get("ALL", {}).get("order_acknowledged")
+    return stats[1] if stats else default
+
+
+async def latest_price(client, asset, now):
+    """Last traded price, from the most recent 5s candle (or the replayed recording)."""
+    if hasattr(client, "price_at"):
+        return client.price_at(asset)
+    candles = await client.get_candles(asset, now, 10, 5)
+    if not candles:
+        return None
+    return candles[-1]["close"]
+
+
+class PaperBroker:
+    """Simulates buy/check_win against live prices while passing data calls to the real client.
+
+    Drop it in wherever the Quotex client is used: entries are filled at the
+    live price after `latency` seconds and settled at the live price on expiry.
+    Pass a ReplayClient as `clock` to fill and settle on the recording's time.
+    """
+
+    def __init__(self, client, name="paper", balance=PAPER_BALANCE, latency=ORDER_LATENCY, payouts=None, clock=None):
+        self._client = client
+        self.clock = clock or WallClock()
+        self.name = name
+        self.balance = float(balance)
+        self.latency = latency
+        self.payouts = payouts  # AssetCache, for per-asset payout
+        self._ids = itertools.count(1)
+        self.trades = {}
+        self.stats = {"total_trades": 0, "wins": 0, "losses": 0, "dojis": 0, "profit": 0.0}
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    async def get_balance(self):
+        return self.balance
+
+    def _payout(self, asset):
+        payout = self.payouts.payout(asset) if self.payouts else None
+        return payout / 100 if payout else DEFAULT_PAYOUT
+
+    def open_assets(self):
+        return {trade["asset"] for trade in self.trades.values() if trade["result"] is None}
+
+    async def buy(self, amount, asset, direction, duration):
+        if amount > self.balance:
+            return False, "Insufficient paper balance"
+        await self.clock.sleep(self.latency)
+        price = await latest_price(self._client, asset, self.clock.time())
+        if price is None:
+            return False, f"No price for {asset}"
+
+        trade_id = f"{self.name}-{next(self._ids)}"
+        payout = self._payout(asset)
+        self.balance -= amount
+        self.trades[trade_id] = {
+            "asset": asset, "direction": direction, "amount": amount, "open_price": price,
+            "expires_at": self.clock.time() + duration, "payout": payout, "result": None,
+        }
+        return True, {"id": trade_id, "openPrice": price, "profit": round(amount * payout, 2)}
+
+    async def check_win(self, trade_id):
+        trade = self.trades.get(trade_id)
+        if trade is None:
+            return None
+        if trade["result"] is None:
+            remaining = trade["expires_at"] - self.clock.time()
+            if remaining > 0:
+                await self.clock.sleep(remaining)
+            close_price = await latest_price(self._client, trade["asset"], self.clock.time())
+            self._settle(trade, close_price)
+        return {"win": True, "loss": False}.get(trade["result"])
+
+    def _settle(self, trade, close_price):
+        if trade["result"] is not None:
+            return
+        move = (close_price or trade["open_price"]) - trade["open_price"]
+        if trade["direction"] == "put":
+            move = -move
+
+        self.stats["total_trades"] += 1
+        if move > 0:
+            trade["result"] = "win"
+            profit = trade["amount"] * trade["payout"]
+            self.balance += trade["amount"] + profit
+            self.stats["wins"] += 1
+        elif move < 0:
+            trade["result"] = "loss"
+            profit = -trade["amount"]
+            self.stats["losses"] += 1
+        else:
+            trade["result"] = "doji"
+            profit = 0
+            self.balance += trade["amount"]  # Draws are refunded
+            self.stats["dojis"] += 1
+        self.stats["profit"] += profit
+
+    def summary(self):
+        s = self.stats
+        decided = s["wins"] + s["losses"]
+        win_rate = s["wins"] / decided if decided else 0
+        return (f"📝 [{self.name}] Trades: {s['total_trades']} | Wins: {s['wins']} | Losses: {s['losses']} | "
+                f"Dojis: {s['dojis']} | Win rate: {win_rate:.1%} | P/L: {s['profit']:.2f} | Balance: {self.balance:.2f}")
+
+
+async def run_paper_trade(broker, asset, direction, stake, duration=60, entry_second=59):
+    """Places one paper trade at the next candle start and logs the variant's running summary.
+
+    Returns "win", "loss" or "doji", or None if the order was not filled.
+    """
+    await broker.clock.sleep(entry_second - int(broker.clock.time()) % 60)
+    status, info = await broker.buy(stake, asset, direction, duration)
+    if not status:
+        logging.info(f"[{broker.name}] Paper trade on {asset} not filled: {info}")
+        return None
+    await broker.check_win(info["id"])
+    logging.info(broker.summary())
+    return broker.trades[info["id"]]["result"]
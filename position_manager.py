@@ -0,0 +1,102 @@
+import asyncio
+import itertools
+import logging
+
+# Default exposure limits
+MAX_OPEN_TRADES = 3  # Concurrent open trades across all assets
+MAX_TRADES_PER_ASSET = 1  # Concurrent open trades on a single asset
+MAX_CURRENCY_EXPOSURE = 5  # Total stake touching one currency (e.g. USD)
+MAX_TOTAL_EXPOSURE = 10  # Total stake across all open trades
+
+
+# Split "USDINR_otc" into ("USD", "INR")
+def asset_currencies(asset):
+    """Returns the base and quote currency of an asset name."""
+    symbol = asset.split("_")[0].upper()
+    if len(symbol) != 6:
+        return (symbol,)
+    return symbol[:3], symbol[3:]
+
+
+class PositionManager:
+    """Tracks open trades and enforces exposure limits atomically."""
+
+    def __init__(self, max_open_trades=MAX_OPEN_TRADES, max_trades_per_asset=MAX_TRADES_PER_ASSET,
+                 max_currency_exposure=MAX_CURRENCY_EXPOSURE, max_total_exposure=MAX_TOTAL_EXPOSURE):
+        self.max_open_trades = max_open_trades
+        self.max_trades_per_asset = max_trades_per_asset
+        self.max_currency_exposure = max_currency_exposure
+        self.max_total_exposure = max_total_exposure
+        # Optional correlated_with(asset, open_assets) -> an open asset that moves with asset, or None
+        self.correlated_with = None
+
+        # One lock shared by every caller, so check-and-reserve is atomic
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self.positions = {}  # position_id -> {"asset", "stake", "currencies"}
+        self.asset_counts = {}
+        self.currency_exposure = {}
+        self.total_exposure = 0
+
+    def _rejection_reason(self, asset, stake):
+        if len(self.positions) >= self.max_open_trades:
+            return f"max open trades ({self.max_open_trades}) reached"
+        if self.asset_counts.get(asset, 0) >= self.max_trades_per_asset:
+            return f"max trades per asset ({self.max_trades_per_asset}) reached"
+        if self.total_exposure + stake > self.max_total_exposure:
+            return f"total exposure would exceed {self.max_total_exposure}"
+        for currency in asset_currencies(asset):
+            if self.currency_exposure.get(currency, 0) + stake > self.max_currency_exposure:
+                return f"{currency} exposure would exceed {self.max_currency_exposure}"
+        if self.correlated_with is not None:
+            other = self.correlated_with(asset, self.open_assets())
+            if other:
+                return f"moves with {other}, which is already open"
+        return None
+
+    def can_open(self, asset, stake):
+        """Cheap pre-check for the scanner; open() still re-checks under the lock."""
+        return self._rejection_reason(asset, stake) is None
+
+    async def open(self, asset, stake):
+        """Reserves exposure for a new trade. Returns a position ID, or None if a limit is hit."""
+        async with self._lock:
+            reason = self._rejection_reason(asset, stake)
+            if reason:
+                logging.info(f"[{asset}] - Position rejected: {reason}")
+                return None
+
+            position_id = next(self._ids)
+            currencies = asset_currencies(asset)
+            self.positions[position_id] = {"asset": asset, "stake": stake, "currencies": currencies}
+            self.asset_counts[asset] = self.asset_counts.get(asset, 0) + 1
+            for currency in currencies:
+                self.currency_exposure[currency] = self.currency_exposure.get(currency, 0) + stake
+            self.total_exposure += stake
+            return position_id
+
+    async def close(self, position_id):
+        """Releases the exposure held by a position."""
+        async with self._lock:
+            position = self.positions.pop(position_id, None)
+            if position is None:
+                return
+
+            asset = position["asset"]
+            stake = position["stake"]
+            self.asset_counts[asset] -= 1
+            if not self.asset_counts[asset]:
+                del self.asset_counts[asset]
+            for currency in position["currencies"]:
+                self.currency_exposure[currency] -= stake
+                if not self.currency_exposure[currency]:
+                    del self.currency_exposure[currency]
+            self.total_exposure -= stake
+
+    def open_assets(self):
+        return {position["asset"] for position in self.positions.values()}
+
+    def summary(self):
+        return (f"Open: {len(self.positions)}/{self.max_open_trades} | "
+                f"Exposure: {self.total_exposure}/{self.max_total_exposure} | "
+                f"By currency: {self.currency_exposure}")
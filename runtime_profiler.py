@@ -0,0 +1,153 @@
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_DIR = "profiles"
+PROFILE_DURATION = 30  # Seconds per window unless start() is given one
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+SLOW_CALLBACK_MS = 50  # Event loop callbacks longer than this are reported
+TOP_FUNCTIONS = 15
+
+# Leaf frames that mean a thread is waiting rather than working
+IDLE_FUNCTIONS = {"select", "poll", "wait", "_worker", "sleep"}
+
+
+class _SlowCallbackCollector(logging.Handler):
+    """Catches asyncio's debug-mode "Executing <Handle ...> took N seconds" warnings."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith("Executing "):
+            self.messages.append(message)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RuntimeProfiler:
+    """Samples every thread's stack for a time window while the bot keeps trading.
+
+    Writes collapsed stacks (one "frame;frame;... count" line per stack), which
+    flamegraph.pl, speedscope and inferno read directly, and logs the hottest
+    functions plus any event loop callbacks that blocked for too long.
+    """
+
+    def __init__(self, output_dir=PROFILE_DIR, interval=SAMPLE_INTERVAL, slow_callback_ms=SLOW_CALLBACK_MS,
+                 duration=PROFILE_DURATION):
+        self.output_dir = output_dir
+        self.duration = duration
+        self.interval = interval
+        self.slow_callback_ms = slow_callback_ms
+        self.loop = None
+        self._thread = None
+        self._collector = None
+        self._loop_debug = False
+        self._slow_callback_duration = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def install_signal_handler(self, loop, signum=getattr(signal, "SIGUSR1", None)):
+        """`kill -USR1 <pid>` starts a profiling window of `self.duration`, read when the signal arrives (Unix only)."""
+        if signum is None:
+            return
+        try:
+            loop.add_signal_handler(signum, self.start)
+        except (NotImplementedError, RuntimeError):
+            logging.warning("⚠️ Signal-triggered profiling is not available on this platform.")
+
+    def start(self, duration=None, loop=None):
+        """Starts a window; call from the event loop thread."""
+        duration = self.duration if duration is None else duration
+        if self.running:
+            logging.info("🔬 Profiler already running.")
+            return
+        if loop is None:
+            import asyncio
+            loop = asyncio.get_running_loop()
+        self.loop = loop
+
+        # Debug mode makes asyncio time every callback; only on for the window
+        self._loop_debug = loop.get_debug()
+        self._slow_callback_duration = loop.slow_callback_duration
+        loop.slow_callback_duration = self.slow_callback_ms / 1000
+        loop.set_debug(True)
+        self._collector = _SlowCallbackCollector()
+        logging.getLogger("asyncio").addHandler(self._collector)
+
+        logging.info(f"🔬 Profiling for {duration}s (sampling every {self.interval * 1000:.0f}ms)")
+        self._thread = threading.Thread(target=self._sample, args=(duration,), name="runtime-profiler", daemon=True)
+        self._thread.start()
+
+    def _sample(self, duration):
+        own_id = threading.get_ident()
+        stacks = Counter()
+        samples = 0
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(labels))] += 1
+            samples += 1
+            time.sleep(self.interval)
+        self.loop.call_soon_threadsafe(self._finish, stacks, samples)
+
+    def _finish(self, stacks, samples):
+        self.loop.set_debug(self._loop_debug)
+        self.loop.slow_callback_duration = self._slow_callback_duration
+        logging.getLogger("asyncio").removeHandler(self._collector)
+        slow_callbacks = self._collector.messages
+        path = self._write(stacks)
+        logging.info(self.report(stacks, samples, slow_callbacks, path))
+
+    def _write(self, stacks):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def report(self, stacks, samples, slow_callbacks, path):
+        own = Counter()
+        inclusive = Counter()
+        idle = 0
+        for stack, count in stacks.items():
+            frames = stack.split(";")[1:]  # Drop the thread name
+            if not frames:
+                continue
+            if frames[-1].split(" ", 1)[0] in IDLE_FUNCTIONS:
+                idle += count
+                continue
+            own[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+        total = sum(stacks.values()) or 1
+
+        # Percentages are of all thread samples; idle waits are left out of the ranking
+        lines = [f"🔬 Profile: {samples} samples, {idle / total:.0%} idle -> {path}",
+                 f"  {'function':<60}{'self %':>8}{'total %':>9}"]
+        for label, count in own.most_common(TOP_FUNCTIONS):
+            lines.append(f"  {label[:60]:<60}{count / total * 100:>8.1f}{inclusive[label] / total * 100:>9.1f}")
+        if slow_callbacks:
+            lines.append(f"  ⚠️ {len(slow_callbacks)} event loop callbacks took over {self.slow_callback_ms}ms:")
+            lines.extend(f"    {message}" for message in slow_callbacks[:TOP_FUNCTIONS])
+        return "\n".join(lines)
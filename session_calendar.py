@@ -0,0 +1,90 @@
+import datetime
+
+# IST has no daylight saving, so a fixed offset replaces a pytz lookup
+IST = datetime.timezone(datetime.timedelta(hours=5, minutes=30), "IST")
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday (Monday = 0)
+ALL_DAYS = [0, 1, 2, 3, 4, 5, 6]
+
+
+def minute_of_week(timestamp):
+    """Minute index (0 = Monday 00:00 IST) for a UTC timestamp in seconds."""
+    return ((int(timestamp) + IST_OFFSET_SECONDS) // 60 + EPOCH_WEEKDAY * MINUTES_PER_DAY) % MINUTES_PER_WEEK
+
+
+def _parse_hhmm(value):
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _window_minutes(window):
+    """Yields every minute of the week covered by {"days", "start", "end"} (IST)."""
+    start = _parse_hhmm(window["start"])
+    end = _parse_hhmm(window["end"])
+    length = (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY  # Windows may wrap past midnight
+    for day in window.get("days", ALL_DAYS):
+        first = day * MINUTES_PER_DAY + start
+        for minute in range(first, first + length):
+            yield minute % MINUTES_PER_WEEK
+
+
+def _build_table(sessions, blackouts):
+    if sessions:
+        table = bytearray(MINUTES_PER_WEEK)
+        for window in sessions:
+            for minute in _window_minutes(window):
+                table[minute] = 1
+    else:
+        table = bytearray(b"\x01" * MINUTES_PER_WEEK)
+    for window in blackouts:
+        for minute in _window_minutes(window):
+            table[minute] = 0
+    return table
+
+
+class SessionCalendar:
+    """Per-asset table of which minutes of the week are tradeable.
+
+    Config (all times IST):
+        {"enabled": true,
+         "sessions": [{"days": [0, 1, 2, 3, 4], "start": "09:00", "end": "23:30"}],
+         "blackouts": [{"start": "02:00", "end": "04:00"}],
+         "assets": {"USDINR_otc": {"sessions": [...], "blackouts": [...]}}}
+    Empty sessions mean "always open"; blackouts are removed from the sessions.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.enabled = config.get("enabled", False)
+        self.default_table = _build_table(config.get("sessions", []), config.get("blackouts", []))
+        self.tables = {}
+        for asset, overrides in config.get("assets", {}).items():
+            self.tables[asset] = _build_table(
+                overrides.get("sessions", config.get("sessions", [])),
+                config.get("blackouts", []) + overrides.get("blackouts", []),
+            )
+
+    def table(self, asset):
+        return self.tables.get(asset, self.default_table)
+
+    def is_allowed(self, asset, timestamp):
+        if not self.enabled:
+            return True
+        return bool(self.table(asset)[minute_of_week(timestamp)])
+
+    def mask(self, asset, timestamps):
+        """Boolean array: which of the given UTC timestamps fall in allowed minutes."""
+        import numpy as np
+
+        times = np.asarray(timestamps, dtype=np.int64)
+        if not self.enabled:
+            return np.ones(times.shape, dtype=bool)
+        minutes = ((times + IST_OFFSET_SECONDS) // 60 + EPOCH_WEEKDAY * MINUTES_PER_DAY) % MINUTES_PER_WEEK
+        return np.frombuffer(bytes(self.table(asset)), dtype=np.uint8)[minutes].astype(bool)
+
+    def filter_candles(self, asset, candles):
+        """Keeps only candles whose open time is in an allowed minute (for backtests)."""
+        allowed = self.mask(asset, [candle["time"] for candle in candles])
+        return [candle for candle, keep in zip(candles, allowed) if keep]
@@ -0,0 +1,35 @@
+import json
+import logging
+import os
+
+CHECKPOINT_FILE = "session_state.json"
+
+
+class Checkpoint:
+    """Atomically persists session state so a restart can pick up where it left off."""
+
+    def __init__(self, path=CHECKPOINT_FILE):
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+
+    def save(self, state):
+        try:
+            # Write a temp file and rename it over the old one, so a crash mid-write
+            # leaves the previous checkpoint intact
+            with open(self._tmp_path, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self._tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"❌ Could not save checkpoint {self.path}: {e}")
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.error(f"❌ Could not read checkpoint {self.path}: {e}")
+            return None
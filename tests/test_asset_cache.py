@@ -0,0 +1,27 @@
+from asset_cache import AssetCache
+
+
+class EmptyClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_instruments(self):
+        self.calls += 1
+        return []
+
+
+async def test_failed_refresh_backs_off():
+    cache = AssetCache(ttl=300)
+    client = EmptyClient()
+    for _ in range(5):
+        await cache.maybe_refresh(client)
+    assert client.calls == 1
+    assert cache.failures == 1
+    assert cache.retry_at > cache.last_refresh
+
+
+def test_pushed_payout_keeps_asset_tradeable():
+    cache = AssetCache()
+    cache.update("USDINR_otc", payout=85)
+    assert cache.payout("USDINR_otc") == 85
+    assert cache.is_tradeable("USDINR_otc", min_payout=80)
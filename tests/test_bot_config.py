@@ -0,0 +1,58 @@
+import json
+import os
+
+from bot_config import ConfigWatcher
+from session_calendar import SessionCalendar
+
+BASE = {"assets": ["EURUSD_otc"], "initial_stake": 1, "target_profit": 10, "stop_loss": 10}
+
+
+def write_config(path, config, mtime):
+    path.write_text(json.dumps(config))
+    os.utime(path, (mtime, mtime))
+
+
+def test_invalid_reload_keeps_previous_config(tmp_path):
+    path = tmp_path / "bot_config.json"
+    write_config(path, BASE, 1000)
+    watcher = ConfigWatcher(str(path))
+    applied = []
+    watcher.on_change(applied.append, validate=lambda cfg: SessionCalendar(cfg["time_filter"]))
+
+    bad = dict(BASE, initial_stake=5, time_filter={"blackouts": [{"start": "2am", "end": "04:00"}]})
+    write_config(path, bad, 2000)
+    assert not watcher.reload_if_changed()
+    assert watcher["initial_stake"] == 1
+    assert applied == []
+
+    write_config(path, dict(BASE, initial_stake=2), 3000)
+    assert watcher.reload_if_changed()
+    assert watcher["initial_stake"] == 2
+    assert len(applied) == 1
+
+
+def test_failing_callback_does_not_stop_other_callbacks(tmp_path):
+    path = tmp_path / "bot_config.json"
+    write_config(path, BASE, 1000)
+    watcher = ConfigWatcher(str(path))
+    applied = []
+
+    def broken(cfg):
+        raise RuntimeError("boom")
+
+    watcher.on_change(broken)
+    watcher.on_change(applied.append)
+    write_config(path, dict(BASE, stop_loss=20), 2000)
+    assert watcher.reload_if_changed()
+    assert applied and applied[0]["stop_loss"] == 20
+
+
+def test_nested_required_keys(tmp_path):
+    path = tmp_path / "bot_config.json"
+    write_config(path, {"fibo": {"stake": 1}}, 1000)
+    try:
+        ConfigWatcher(str(path), required=["fibo.assets", "fibo.stake"])
+    except ValueError as e:
+        assert "fibo.assets" in str(e)
+    else:
+        raise AssertionError("missing fibo.assets was accepted")
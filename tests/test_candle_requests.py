@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import candle_requests
+from candle_requests import CandleRequestLayer, TokenBucket
+
+CANDLES = [{"time": 0, "open": 1, "close": 1, "high": 1, "low": 1}]
+
+
+class SlowClient:
+    """get_candles blocks until `release` is set, counting the calls that reach it."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def get_candles(self, asset, end_time, offset, period):
+        self.calls += 1
+        await self.release.wait()
+        return CANDLES
+
+
+class FakeTime:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return time.monotonic()
+
+
+async def test_concurrent_requests_share_one_fetch():
+    client = SlowClient()
+    layer = CandleRequestLayer(client, rate=100, burst=10)
+    end = time.time()
+    calls = [asyncio.ensure_future(layer.get_candles("EURUSD_otc", end, 600, 60)) for _ in range(5)]
+    await asyncio.sleep(0)
+    client.release.set()
+    assert await asyncio.gather(*calls) == [CANDLES] * 5
+    assert client.calls == 1
+    assert layer.stats == {"requests": 5, "cache_hits": 0, "coalesced": 4, "network": 1}
+    assert layer.inflight == {}
+
+    # Within the TTL the cached response is reused without a request
+    assert await layer.get_candles("EURUSD_otc", end, 600, 60) == CANDLES
+    assert layer.stats["cache_hits"] == 1
+    assert client.calls == 1
+
+
+async def test_cache_expires_after_ttl_and_at_period_end(monkeypatch):
+    clock = FakeTime(1_700_000_010.0)
+    monkeypatch.setattr(candle_requests, "time", clock)
+    client = SlowClient()
+    client.release.set()
+    layer = CandleRequestLayer(client, rate=100, burst=10, cache_ttl=2)
+
+    await layer.get_candles("EURUSD_otc", clock.now, 600, 60)
+    clock.now += 1.9
+    await layer.get_candles("EURUSD_otc", clock.now, 600, 60)
+    assert client.calls == 1
+    clock.now += 0.2
+    await layer.get_candles("EURUSD_otc", clock.now, 600, 60)
+    assert client.calls == 2
+
+    # A response never outlives its candle period, even within the TTL
+    clock.now = 1_700_000_039.5
+    await layer.get_candles("EURUSD_otc", clock.now, 10, 5)
+    assert [expires for expires, _ in layer.cache.values()][-1] == 1_700_000_040
+
+
+async def test_cancelled_caller_does_not_cancel_shared_fetch():
+    client = SlowClient()
+    layer = CandleRequestLayer(client, rate=100, burst=10)
+    end = time.time()
+    first = asyncio.ensure_future(layer.get_candles("EURUSD_otc", end, 600, 60))
+    second = asyncio.ensure_future(layer.get_candles("EURUSD_otc", end, 600, 60))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    client.release.set()
+    assert await second == CANDLES
+    assert first.cancelled()
+    assert client.calls == 1
+
+
+async def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate=100, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.01
+    for _ in range(3):
+        await bucket.acquire()
+    # Three more tokens at 100/s take about 30ms
+    assert time.monotonic() - start >= 0.025
+    assert bucket.tokens < 1
+
+
+class CountingClient:
+    """Tracks how many get_candles calls are in flight at once."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.active = 0
+        self.peak = 0
+
+    async def get_candles(self, asset, end_time, offset, period):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if asset in self.failing:
+            raise ConnectionError("socket closed")
+        return [{"time": end_time, "asset": asset}]
+
+
+async def test_fetch_all_candles_is_concurrent_but_bounded():
+    client = CountingClient(failing={"GBPJPY_otc"})
+    assets = [f"ASSET{i}_otc" for i in range(7)] + ["GBPJPY_otc"]
+    start = time.monotonic()
+    candles, received_at = await candle_requests.fetch_all_candles(client, assets, 3, FakeTime(1_700_000_000.5))
+
+    assert client.peak == 3
+    assert time.monotonic() - start < 8 * 0.01  # Overlapping, not one after another
+    assert list(candles) == assets
+    assert candles["ASSET0_otc"] == [{"time": 1_700_000_000, "asset": "ASSET0_otc"}]
+    assert candles["GBPJPY_otc"] is None  # A failed asset doesn't fail the batch
+    assert set(received_at) == set(assets)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from batch_indicators import PriceMatrix
+from correlation_tracker import CorrelationTracker
+
+
+def candles(closes, end):
+    start = end - 60 * (len(closes) - 1)
+    return [{"time": start + 60 * i, "open": c, "high": c, "low": c, "close": c} for i, c in enumerate(closes)]
+
+
+def test_only_closed_aligned_candles_are_fed():
+    rng = np.random.default_rng(1)
+    base = 100 + np.cumsum(rng.normal(size=40))
+    noise = 100 + np.cumsum(rng.normal(size=40))
+    prices = PriceMatrix({
+        "EURUSD_otc": candles(list(base), 6000),
+        "GBPUSD_otc": candles(list(base * 1.3), 6000),
+        # Fetched just before the boundary: its latest candle is one slot behind the others
+        "USDJPY_otc": candles(list(noise[:-1]), 5940),
+    })
+    assert prices.closed_columns == prices.close.shape[1] - 2
+
+    tracker = CorrelationTracker(window=60, threshold=0.8)
+    tracker.update_from_matrix(prices)
+    assert tracker.last_time == 5880
+    assert tracker.cluster_of("EURUSD_otc") == {"EURUSD_otc", "GBPUSD_otc"}
+    assert tracker.cluster_of("USDJPY_otc") == {"USDJPY_otc"}
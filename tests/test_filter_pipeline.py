@@ -0,0 +1,56 @@
+import time
+
+from filter_pipeline import MIN_CALLS_BEFORE_REORDER, FilterPipeline, PhaseTimer, Stage
+
+
+def slow_pass(ctx):
+    time.sleep(0.0002)
+
+
+def cheap_reject(ctx):
+    return "" if ctx["i"] % 2 else None
+
+
+def test_reorder_puts_cheap_selective_stages_first():
+    pipeline = FilterPipeline([Stage("slow", slow_pass), Stage("never", lambda ctx: None),
+                               Stage("cheap", cheap_reject)])
+    for i in range(MIN_CALLS_BEFORE_REORDER * 2):
+        pipeline.run({"i": i})
+
+    # Stages that never reject rank last, keeping their relative order
+    pipeline.reorder()
+    assert [stage.name for stage in pipeline.stages] == ["cheap", "slow", "never"]
+    assert pipeline.passes == MIN_CALLS_BEFORE_REORDER
+
+
+def test_reorder_waits_for_enough_calls():
+    pipeline = FilterPipeline([Stage("slow", slow_pass), Stage("cheap", cheap_reject)])
+    for i in range(MIN_CALLS_BEFORE_REORDER - 1):
+        pipeline.run({"i": i})
+    pipeline.reorder()
+    assert [stage.name for stage in pipeline.stages] == ["slow", "cheap"]
+
+
+def test_auto_reorder_only_changes_reasons_not_results():
+    stages = [Stage("slow", slow_pass), Stage("odd", cheap_reject),
+              Stage("third", lambda ctx: "" if ctx["i"] % 3 == 0 else None)]
+    manual = FilterPipeline([Stage(s.name, s.func) for s in stages])
+    auto = FilterPipeline(stages, auto_reorder=True, reorder_every=MIN_CALLS_BEFORE_REORDER)
+    for i in range(MIN_CALLS_BEFORE_REORDER * 3):
+        assert (manual.run({"i": i}) is None) == (auto.run({"i": i}) is None)
+    assert auto.stages[-1].name == "slow"
+
+
+def test_phase_timer_report():
+    timer = PhaseTimer()
+    for _ in range(3):
+        with timer.phase("fetch"):
+            time.sleep(0.002)
+        with timer.phase("indicators"):
+            pass
+    assert [name for name in timer.phases] == ["fetch", "indicators"]
+    assert timer.phases["fetch"][0] == 3
+    assert timer.phases["fetch"][1] >= 3 * 2_000_000
+    report = timer.report()
+    assert report.splitlines()[0] == "⏱️ Scan cycle: 3 cycles"
+    assert "fetch" in report and "indicators" in report
@@ -0,0 +1,43 @@
+import glob
+
+from market_recorder import MarketRecorder, ReplayClient, read_recording
+
+
+def candles(close):
+    return [{"time": 0, "open": close, "close": close, "high": close, "low": close}]
+
+
+def record(directory):
+    recorder = MarketRecorder(directory)
+    # 5s lookups and assets the bot no longer trades must not keep the replay alive
+    for t, asset, period, close in [(100, "USDINR_otc", 60, 1.0), (130, "USDINR_otc", 5, 9.0),
+                                    (140, "EURGBP_otc", 60, 7.0), (160, "USDINR_otc", 60, 2.0),
+                                    (220, "USDINR_otc", 60, 3.0)]:
+        recorder.record("candles", candles(close), received=t, asset=asset, end_time=t, offset=10800, period=period)
+    recorder.close()
+
+
+def test_truncated_chunk_is_read_up_to_the_cut(tmp_path):
+    record(str(tmp_path))
+    path = glob.glob(str(tmp_path / "*.jsonl.gz"))[0]
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-10])
+    assert len(list(read_recording(str(tmp_path)))) == 5
+
+
+async def test_replay_serves_recorded_data_on_its_own_clock(tmp_path):
+    record(str(tmp_path))
+    replay = ReplayClient(str(tmp_path), speed=0)
+
+    seen = []
+    while not replay.finished():
+        response = await replay.get_candles("USDINR_otc", replay.time(), 10800, 60)
+        seen.append((replay.time(), response[-1]["close"], replay.price_at("USDINR_otc")))
+        await replay.sleep(30)
+    assert seen[0] == (100, 1.0, 1.0)
+    assert (130, 1.0, 9.0) in seen
+    assert seen[-1] == (190, 2.0, 2.0)
+    assert replay.time() == 220
+    assert replay.finished()
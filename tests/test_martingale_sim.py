@@ -0,0 +1,27 @@
+import numpy as np
+
+from martingale_sim import simulate
+
+
+def test_always_winning_reaches_target_at_the_same_trade():
+    result = simulate(100, 1, win_rate=1.0, payout=0.5, target=105, simulations=1000, seed=1)
+    assert result["prob_target"] == 1.0
+    assert result["risk_of_ruin"] == 0.0
+    assert list(result["trades_to_target"]) == [10, 10, 10]
+    assert list(result["max_drawdown"]) == [0, 0, 0, 0]
+
+
+def test_always_losing_follows_martingale_sizing_to_ruin():
+    # Stakes 1, 2, 4, 8 (stage 3 is past max_stages=2, so it resets to 1), 1, 2, ...
+    result = simulate(20, 1, win_rate=0.0, payout=0.8, factor=2, max_stages=2, simulations=1000, seed=1)
+    assert result["risk_of_ruin"] == 1.0
+    # 20 -> 19 -> 17 -> 13 -> 5 (next stake 1) -> 4 -> 2 (next stake 4 cannot be funded)
+    assert list(result["trades_to_ruin"]) == [6, 6, 6]
+    assert np.allclose(result["final_balance"], 2)
+    assert np.allclose(result["max_drawdown"], 18)
+
+
+def test_unfinished_runs_keep_their_final_state():
+    result = simulate(1000, 1, win_rate=0.5, payout=1.0, target=None, max_trades=50, simulations=20000, seed=3)
+    assert result["prob_unfinished"] == 1.0
+    assert result["final_balance"][0] < 1000 < result["final_balance"][2]
@@ -0,0 +1,83 @@
+from paper_trading import PaperBroker, run_paper_trade
+
+
+class FixedClock:
+    def __init__(self, now=1_700_000_000):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += max(seconds, 0)
+
+
+class Prices:
+    """Replay-style client: price_at returns whatever the test sets."""
+
+    def __init__(self, price):
+        self.price = price
+
+    def price_at(self, asset):
+        return self.price
+
+
+def open_trade(broker, direction, amount=10, open_price=1.0, payout=0.8):
+    broker.balance -= amount
+    return {"asset": "EURUSD_otc", "direction": direction, "amount": amount, "open_price": open_price,
+            "expires_at": 0, "payout": payout, "result": None}
+
+
+def test_settle_win_loss_and_doji():
+    broker = PaperBroker(Prices(1.0), balance=100)
+
+    call = open_trade(broker, "call")
+    broker._settle(call, 1.1)
+    assert call["result"] == "win"
+    assert broker.balance == 100 + 8
+
+    put = open_trade(broker, "put")
+    broker._settle(put, 1.1)
+    assert put["result"] == "loss"
+    assert broker.balance == 98
+
+    doji = open_trade(broker, "put")
+    broker._settle(doji, 1.0)
+    assert doji["result"] == "doji"
+    assert broker.balance == 98  # Stake refunded
+
+    assert broker.stats == {"total_trades": 3, "wins": 1, "losses": 1, "dojis": 1, "profit": -2}
+
+
+def test_settle_twice_and_missing_close_price():
+    broker = PaperBroker(Prices(1.0), balance=100)
+    trade = open_trade(broker, "put")
+    broker._settle(trade, 0.9)
+    broker._settle(trade, 2.0)
+    assert trade["result"] == "win"
+    assert broker.stats["total_trades"] == 1
+    assert broker.balance == 108
+
+    # No price at expiry settles at the open price, as a refunded doji
+    trade = open_trade(broker, "call")
+    broker._settle(trade, None)
+    assert trade["result"] == "doji"
+    assert broker.balance == 108
+
+
+async def test_run_paper_trade_returns_the_result():
+    clock = FixedClock()
+    prices = Prices(1.0)
+    broker = PaperBroker(prices, balance=100, latency=0.3, clock=clock)
+
+    async def move_before_expiry(seconds):
+        await FixedClock.sleep(clock, seconds)
+        if broker.open_assets():
+            prices.price = 0.9
+
+    clock.sleep = move_before_expiry
+    assert await run_paper_trade(broker, "EURUSD_otc", "put", 10) == "win"
+    assert int(next(iter(broker.trades.values()))["expires_at"] - 0.3) % 60 == 59
+    assert broker.balance == 108
+    assert broker.open_assets() == set()
+    assert await run_paper_trade(broker, "EURUSD_otc", "call", 1000) is None  # Not enough paper balance
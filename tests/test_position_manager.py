@@ -0,0 +1,44 @@
+import asyncio
+
+from position_manager import PositionManager, asset_currencies
+
+
+def test_asset_currencies():
+    assert asset_currencies("USDINR_otc") == ("USD", "INR")
+
+
+async def test_concurrent_open_respects_limits():
+    manager = PositionManager(max_open_trades=3, max_trades_per_asset=1,
+                              max_currency_exposure=2, max_total_exposure=10)
+    assets = ["USDINR_otc", "USDPKR_otc", "USDBDT_otc", "EURGBP_otc", "EURGBP_otc", "NZDJPY_otc"]
+    ids = await asyncio.gather(*(manager.open(asset, 1) for asset in assets))
+    opened = [asset for asset, position_id in zip(assets, ids) if position_id is not None]
+
+    # Two USD trades fill the USD cap, one EURGBP per asset, then the global cap of 3
+    assert opened == ["USDINR_otc", "USDPKR_otc", "EURGBP_otc"]
+    assert manager.currency_exposure["USD"] == 2
+    assert manager.total_exposure == 3
+
+    # Closing releases everything, and closing twice is harmless
+    ids = [position_id for position_id in ids if position_id is not None]
+    await asyncio.gather(*(manager.close(position_id) for position_id in ids + ids))
+    assert manager.positions == {}
+    assert manager.asset_counts == {}
+    assert manager.currency_exposure == {}
+    assert manager.total_exposure == 0
+
+
+async def test_correlated_asset_is_rejected_while_the_other_is_open():
+    manager = PositionManager(max_open_trades=3, max_currency_exposure=5)
+    cluster = {"EURUSD_otc", "GBPCHF_otc"}
+    manager.correlated_with = lambda asset, open_assets: next(
+        (other for other in open_assets if other != asset and asset in cluster and other in cluster), None)
+
+    first = await manager.open("EURUSD_otc", 1)
+    assert first is not None
+    assert not manager.can_open("GBPCHF_otc", 1)
+    assert await manager.open("GBPCHF_otc", 1) is None
+    assert await manager.open("NZDJPY_otc", 1) is not None
+
+    await manager.close(first)
+    assert await manager.open("GBPCHF_otc", 1) is not None
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from runtime_profiler import RuntimeProfiler
+
+
+async def test_window_restores_loop_settings_and_writes_profile(tmp_path):
+    loop = asyncio.get_running_loop()
+    loop.set_debug(False)
+    loop.slow_callback_duration = 0.25
+    profiler = RuntimeProfiler(output_dir=str(tmp_path), interval=0.001, slow_callback_ms=5, duration=0.05)
+
+    profiler.start()
+    assert loop.get_debug()
+    assert loop.slow_callback_duration == 0.005
+    profiler.start()  # A second start during the window is ignored
+
+    loop.call_soon(time.sleep, 0.02)  # Blocks the loop long enough to be reported
+    # The sampler hands the results back with call_soon_threadsafe; _finish restores the loop
+    for _ in range(200):
+        if not loop.get_debug():
+            break
+        await asyncio.sleep(0.01)
+
+    assert not loop.get_debug()
+    assert loop.slow_callback_duration == 0.25
+    profiles = list(tmp_path.glob("profile-*.folded"))
+    assert len(profiles) == 1
+    assert profiles[0].read_text().strip()
+    assert profiler._collector.messages
+
+
+def test_report_skips_idle_frames():
+    profiler = RuntimeProfiler()
+    stacks = {"MainThread;main (a.py:1);work (a.py:5)": 3, "MainThread;main (a.py:1);select (selectors.py:1)": 1}
+    report = profiler.report(stacks, 4, [], "out.folded")
+    assert "25% idle" in report
+    assert "work (a.py:5)" in report
+    assert "select" not in report.split("\n", 2)[2]
@@ -0,0 +1,36 @@
+from session_calendar import MINUTES_PER_DAY, MINUTES_PER_WEEK, SessionCalendar, minute_of_week
+
+MONDAY_MIDNIGHT_IST = 1704047400  # 2024-01-01 00:00 IST (2023-12-31 18:30 UTC)
+
+
+def test_minute_of_week_starts_monday_midnight_ist():
+    assert minute_of_week(MONDAY_MIDNIGHT_IST) == 0
+    assert minute_of_week(MONDAY_MIDNIGHT_IST - 60) == MINUTES_PER_WEEK - 1
+    assert minute_of_week(MONDAY_MIDNIGHT_IST + 2 * 86400 + 9 * 3600 + 59) == 2 * MINUTES_PER_DAY + 9 * 60
+
+
+def test_window_wraps_past_midnight():
+    calendar = SessionCalendar({"enabled": True, "sessions": [{"days": [0], "start": "22:00", "end": "02:00"}]})
+    monday_22 = MONDAY_MIDNIGHT_IST + 22 * 3600
+    assert calendar.is_allowed("EURUSD_otc", monday_22)
+    assert calendar.is_allowed("EURUSD_otc", monday_22 + 4 * 3600 - 60)  # Tuesday 01:59
+    assert not calendar.is_allowed("EURUSD_otc", monday_22 + 4 * 3600)  # Tuesday 02:00
+    assert not calendar.is_allowed("EURUSD_otc", monday_22 - 60)  # Monday 21:59
+    assert not calendar.is_allowed("EURUSD_otc", MONDAY_MIDNIGHT_IST + 60)  # Monday 00:01
+
+
+def test_sunday_window_wraps_into_monday():
+    calendar = SessionCalendar({"enabled": True, "blackouts": [{"days": [6], "start": "23:00", "end": "01:00"}]})
+    assert not calendar.is_allowed("EURUSD_otc", MONDAY_MIDNIGHT_IST - 3600)
+    assert not calendar.is_allowed("EURUSD_otc", MONDAY_MIDNIGHT_IST + 3600 - 60)
+    assert calendar.is_allowed("EURUSD_otc", MONDAY_MIDNIGHT_IST + 3600)
+
+
+def test_mask_matches_is_allowed():
+    calendar = SessionCalendar({"enabled": True, "sessions": [{"start": "09:00", "end": "17:00"}],
+                                "assets": {"USDINR_otc": {"blackouts": [{"start": "12:00", "end": "13:00"}]}}})
+    times = [MONDAY_MIDNIGHT_IST + minute * 60 for minute in range(0, MINUTES_PER_WEEK, 17)]
+    for asset in ("EURUSD_otc", "USDINR_otc"):
+        assert list(calendar.mask(asset, times)) == [calendar.is_allowed(asset, t) for t in times]
+    candles = [{"time": MONDAY_MIDNIGHT_IST + 12 * 3600}, {"time": MONDAY_MIDNIGHT_IST + 14 * 3600}]
+    assert calendar.filter_candles("USDINR_otc", candles) == candles[1:]
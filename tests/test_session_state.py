@@ -0,0 +1,32 @@
+import os
+
+from session_state import Checkpoint
+
+STATE = {"current_stake": 2.0, "martingale_stage": 1, "martingale_asset": "EURUSD_otc",
+         "trade_summary": {"total_trades": 3, "wins": 1, "losses": 2, "dojis": 0},
+         "open_trade": {"asset": "EURUSD_otc", "id": 42, "stake": 2.0, "expires_at": 1700000060.0},
+         "session_ended": False}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "session_state.json"))
+    assert checkpoint.load() is None
+    checkpoint.save(STATE)
+    assert checkpoint.load() == STATE
+    assert not os.path.exists(checkpoint._tmp_path)
+
+
+def test_failed_save_keeps_previous_checkpoint(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "session_state.json"))
+    checkpoint.save(STATE)
+    try:
+        checkpoint.save({"current_stake": object()})  # Not JSON-serializable: fails mid-write
+    except TypeError:
+        pass
+    assert checkpoint.load() == STATE
+
+
+def test_corrupt_checkpoint_loads_as_none(tmp_path):
+    path = tmp_path / "session_state.json"
+    path.write_text('{"current_stake": 2.0, "martin')
+    assert Checkpoint(str(path)).load() is None
@@ -0,0 +1,17 @@
+from trade_trace import _percentile, stage_durations
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 95) == 95
+    assert _percentile(values, 7) == 7
+    assert _percentile([1, 2, 3, 4], 50) == 2
+    assert _percentile([5], 99) == 5
+
+
+def test_settlement_is_measured_from_expiry():
+    trace = {"spans": {"order_submitted": 0.0, "order_acknowledged": 0.3, "expired": 60.3, "settled": 60.8}}
+    durations = dict(stage_durations(trace))
+    assert durations["expired"] == 60.0
+    assert round(durations["settled"], 6) == 0.5
@@ -0,0 +1,103 @@
+import json
+import logging
+import math
+import sys
+import time
+import uuid
+
+TRACE_FILE = "trade_traces.jsonl"
+
+# Stages in the order a signal passes through them
+STAGES = [
+    "candle_close",
+    "data_received",
+    "indicators_done",
+    "decision",
+    "order_submitted",
+    "order_acknowledged",
+    "expired",
+    "settled",
+]
+
+
+class Trace:
+    """Timestamped spans for one signal, from candle close to settlement."""
+
+    def __init__(self, asset, **spans):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.asset = asset
+        self.spans = dict(spans)
+        self.outcome = None
+        self.stake = None
+        self.payout = None  # Profit per unit staked, as quoted by the broker when the order was filled
+
+    def mark(self, stage, timestamp=None):
+        self.spans[stage] = timestamp if timestamp is not None else time.time()
+
+    def to_dict(self):
+        return {"id": self.trace_id, "asset": self.asset, "outcome": self.outcome, "stake": self.stake,
+                "payout": self.payout, "spans": self.spans}
+
+
+class TraceWriter:
+    """Appends finished traces to a JSON-lines file, one compact line per trace."""
+
+    def __init__(self, path=TRACE_FILE):
+        self.path = path
+
+    def write(self, trace):
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(trace.to_dict(), separators=(",", ":")) + "\n")
+        except OSError as e:
+            logging.error(f"❌ Could not write trace {trace.trace_id}: {e}")
+
+
+def _percentile(sorted_values, pct):
+    # Nearest rank: the smallest value with at least pct% of the samples at or below it
+    index = max(0, math.ceil(pct * len(sorted_values) / 100) - 1)
+    return sorted_values[index]
+
+
+def stage_durations(trace):
+    """Yields (stage, seconds since the previous recorded stage)."""
+    previous = None
+    for stage in STAGES:
+        if stage not in trace["spans"]:
+            continue
+        if previous is not None:
+            yield stage, trace["spans"][stage] - trace["spans"][previous]
+        previous = stage
+
+
+def summarize(path=TRACE_FILE):
+    """Returns {group: {stage: (count, p50, p95, p99)}} for all traces and per asset."""
+    samples = {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            trace = json.loads(line)
+            for stage, duration in stage_durations(trace):
+                for group in ("ALL", trace["asset"]):
+                    samples.setdefault(group, {}).setdefault(stage, []).append(duration)
+
+    report = {}
+    for group, stages in samples.items():
+        report[group] = {}
+        for stage, values in stages.items():
+            values.sort()
+            report[group][stage] = (len(values), _percentile(values, 50), _percentile(values, 95), _percentile(values, 99))
+    return report
+
+
+# Usage: python trade_trace.py [trade_traces.jsonl]
+if __name__ == "__main__":
+    report = summarize(sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE)
+    for group in sorted(report, key=lambda g: (g != "ALL", g)):
+        print(f"\n{group}")
+        print(f"  {'stage':<20}{'n':>6}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+        for stage in STAGES:
+            if stage in report[group]:
+                n, p50, p95, p99 = report[group][stage]
+                print(f"  {stage:<20}{n:>6}{p50 * 1000:>12.1f}{p95 * 1000:>12.1f}{p99 * 1000:>12.1f}")
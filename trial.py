@@ -1,9 +1,20 @@
 import asyncio
+import importlib
 import logging
+import signal
 import time
-import numpy as np
 from quotexapi.config import email, password
 from quotexapi.stable_api import Quotex
+from bot_config import ConfigWatcher
+from asset_cache import AssetCache
+from market_recorder import MarketRecorder, RecordingClient, ReplayClient, WallClock
+from trade_trace import Trace, TraceWriter
+from session_calendar import SessionCalendar
+from session_state import Checkpoint
+from candle_requests import CandleRequestLayer, fetch_all_candles
+from filter_pipeline import FilterPipeline, PhaseTimer, Stage
+from runtime_profiler import RuntimeProfiler
+from paper_trading import PaperBroker, measured_order_latency, run_paper_trade
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
@@ -20,111 +31,27 @@ RSI_PERIOD = 14  # Standard RSI period
 MARTINGALE_FACTOR = 2  # Multiply bet after each loss
 MAX_MARTINGALE_STAGES = 2  # Limit the number of martingale stages
 
-# User input parameters
+# Startup timing, for time-to-first-signal reporting
+STARTED_AT = time.perf_counter()
+first_signal_logged = False
+
+# Session parameters (loaded from bot_config.json)
+config = None
+asset_cache = AssetCache()
+session_calendar = SessionCalendar()
+trace_writer = None
+clock = WallClock()  # Swapped for the ReplayClient so replays run on the recording's time
 initial_balance = 0
 initial_stake = 0
 target_profit = 0
 stop_loss = 0
+paper_target_profit = 0  # Paper and replay sessions are held to limits on the paper balance
+paper_stop_loss = 0
+paper_mode = False
 
 # Dictionary to track Martingale stakes per asset
 martingale_stakes = {}
 
-# Function to calculate the moving average
-def calculate_moving_average(data, period):
-    close_prices = np.array([candle["close"] for candle in data])
-    return np.mean(close_prices[-period:])
-
-# Function to calculate RSI
-def calculate_rsi(data, period=RSI_PERIOD):
-    close_prices = np.array([candle["close"] for candle in data])
-    gains = []
-    losses = []
-    
-    for i in range(1, len(close_prices)):
-        change = close_prices[i] - close_prices[i - 1]
-        gains.append(max(change, 0))
-        losses.append(-min(change, 0))
-    
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
-    if avg_loss == 0:
-        return 100  # Overbought condition
-    
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
-
-# Function to identify the trend
-def identify_trend(data, short_term_period=SHORT_TERM_PERIOD, long_term_period=LONG_TERM_PERIOD):
-    short_term_ma = calculate_moving_average(data, short_term_period)
-    long_term_ma = calculate_moving_average(data, long_term_period)
-    if short_term_ma > long_term_ma:
-        return "Bullish"
-    elif short_term_ma < long_term_ma:
-        return "Bearish"
-    else:
-        return "Sideways"
-
-# Pattern checking functions (same as before)
-def check_bullish_engulfing(data):
-    if len(data) < 2:
-        return False
-    if data[-2]["close"] < data[-2]["open"] and data[-1]["close"] > data[-1]["open"]:
-        return data[-1]["close"] > data[-2]["open"] and data[-1]["open"] < data[-2]["close"]
-    return False
-
-def check_bearish_engulfing(data):
-    if len(data) < 2:
-        return False
-    if data[-2]["close"] > data[-2]["open"] and data[-1]["close"] < data[-1]["open"]:
-        return data[-1]["close"] < data[-2]["open"] and data[-1]["open"] > data[-2]["close"]
-    return False
-
-def check_bullish_harami(data):
-    if len(data) < 2:
-        return False
-    if data[-2]["close"] > data[-2]["open"] and data[-1]["close"] < data[-1]["open"]:
-        return data[-1]["close"] > data[-2]["open"] and data[-1]["open"] < data[-2]["close"]
-    return False
-
-def check_bearish_harami(data):
-    if len(data) < 2:
-        return False
-    if data[-2]["close"] < data[-2]["open"] and data[-1]["close"] > data[-1]["open"]:
-        return data[-1]["close"] < data[-2]["open"] and data[-1]["open"] > data[-2]["close"]
-    return False
-
-# Function to identify a bullish pin bar
-def check_bullish_pin_bar(data):
-    if len(data) < 1:
-        return False
-    candle = data[-1]  # Current candle
-    body_size = abs(candle["close"] - candle["open"])
-    lower_wick = candle["low"] - min(candle["close"], candle["open"])
-    upper_wick = candle["high"] - max(candle["close"], candle["open"])
-
-    # Criteria for a bullish pin bar
-    return (
-        lower_wick > 2 * body_size and  # Lower wick is much longer than the body
-        upper_wick < body_size and  # Upper wick is smaller
-        candle["close"] > candle["open"]  # Bullish candle
-    )
-
-# Function to identify a bearish pin bar
-def check_bearish_pin_bar(data):
-    if len(data) < 1:
-        return False
-    candle = data[-1]  # Current candle
-    body_size = abs(candle["close"] - candle["open"])
-    lower_wick = candle["low"] - min(candle["close"], candle["open"])
-    upper_wick = candle["high"] - max(candle["close"], candle["open"])
-
-    # Criteria for a bearish pin bar
-    return (
-        upper_wick > 2 * body_size and  # Upper wick is much longer than the body
-        lower_wick < body_size and  # Lower wick is smaller
-        candle["close"] < candle["open"]  # Bearish candle
-    )
-    
 async def check_balance(client):
     global initial_balance
     
@@ -132,10 +59,11 @@ async def check_balance(client):
     
     logging.info(f"💰 Current Balance: {balance}")
 
-    if balance >= target_profit:
+    target, stop = (paper_target_profit, paper_stop_loss) if paper_mode else (target_profit, stop_loss)
+    if balance >= target:
         logging.info("🎯 Target Profit Reached! Stopping trading.")
         return True
-    if balance <= stop_loss:
+    if balance <= stop:
         logging.info("❌ Stop Loss Reached! Stopping trading.")
         return True
     return False
@@ -143,79 +71,237 @@ async def check_balance(client):
 # Global Martingale Variables
 current_stake = None  # Will be initialized in main()
 martingale_stage = 0  # Track consecutive losses
+martingale_asset = None  # Asset whose loss started the current martingale sequence
+correlations = None  # CorrelationTracker, created once NumPy is loaded
+main_trade = None  # Task running the main trade; the scan keeps feeding the paper variants meanwhile
+open_trade = None  # Trade placed but not yet settled, kept so a restart can re-attach
+session_ended = False  # Set once the target or stop loss is hit; a resumed session then stays stopped
+paper_variants = []  # (PaperBroker, variant config, FilterPipeline) sharing the live connection
+paper_tasks = set()
+paper_pending = set()  # (variant name, asset) from signal until settlement, so a minute's rescans don't duplicate it
+paper_sizing = {}  # Variant name -> {"stake", "stage"}, martingale-sized like the main session
+profiler = RuntimeProfiler()
+profiler_enabled = False  # Last seen config flag; a False -> True edit starts a window
+checkpoint = None
+
+# Everything needed to resume the session after a crash or restart
+def save_session():
+    if checkpoint is None:
+        return
+    checkpoint.save({
+        "current_stake": current_stake,
+        "martingale_stage": martingale_stage,
+        "martingale_asset": martingale_asset,
+        "martingale_stakes": martingale_stakes,
+        "trade_summary": trade_summary,
+        "initial_balance": initial_balance,
+        "open_trade": open_trade,
+        "session_ended": session_ended,
+    })
+
+# Stake, target and stop loss always come from the config; only progress is restored
+def restore_session(state):
+    global current_stake, martingale_stage, martingale_asset, initial_balance, open_trade, session_ended
+
+    martingale_stage = state["martingale_stage"]
+    martingale_asset = state["martingale_asset"]
+    if martingale_stage > 0:
+        current_stake = state["current_stake"]  # Finish the sequence at the stake it reached
+    martingale_stakes.update(state["martingale_stakes"])
+    trade_summary.update(state["trade_summary"])
+    initial_balance = state["initial_balance"]
+    open_trade = state["open_trade"]
+    session_ended = state.get("session_ended", False)
+    logging.info(f"♻️ Session resumed: stake {current_stake} (Martingale Stage: {martingale_stage}) | "
+                 f"Trades: {trade_summary['total_trades']} | Wins: {trade_summary['wins']} | Losses: {trade_summary['losses']}")
+
+# Wait for a trade placed before the restart to settle, then account for it
+async def reattach_open_trade(client):
+    trade = open_trade
+    logging.info(f"🔁 Re-attaching to open trade {trade['id']} on {trade['asset']} (stake {trade['stake']})")
+    remaining = trade["expires_at"] - clock.time()
+    if remaining > 0:
+        await clock.sleep(remaining)
+    try:
+        win_status = await asyncio.wait_for(client.check_win(trade["id"]), 30)
+    except Exception as e:
+        logging.error(f"⚠️ Could not fetch result for trade {trade['id']}: {e}")
+        win_status = None
+
+    outcome = "win" if win_status is True else "loss" if win_status is False else "undetermined"
+    await record_outcome(client, trade["asset"], outcome)
+
+# Everything apply_config derives from a config, built before any of it is applied;
+# raises if the config is invalid, so a bad edit is rejected instead of half-applied
+def build_config_state(cfg):
+    return {
+        "initial_stake": float(cfg["initial_stake"]),
+        "target_profit": float(cfg["target_profit"]),
+        "stop_loss": float(cfg["stop_loss"]),
+        "paper_target_profit": float(cfg["paper"]["target_profit"]),
+        "paper_stop_loss": float(cfg["paper"]["stop_loss"]),
+        "martingale_factor": float(cfg["martingale"]["factor"]),
+        "max_martingale_stages": int(cfg["martingale"]["max_stages"]),
+        "asset_cache_ttl": float(cfg["asset_cache_ttl"]),
+        "session_calendar": SessionCalendar(cfg["time_filter"]),
+        "auto_reorder": bool(cfg["pipeline"]["auto_reorder"]),
+        "profiler": {key: cfg["profiler"][key]
+                     for key in ("enabled", "output_dir", "interval", "slow_callback_ms", "duration")},
+    }
+
+# Apply config values; called at startup and on every config reload
+def apply_config(cfg):
+    global initial_stake, target_profit, stop_loss, current_stake, session_calendar
+    global paper_target_profit, paper_stop_loss
+    global MARTINGALE_FACTOR, MAX_MARTINGALE_STAGES, profiler_enabled
+
+    state = build_config_state(cfg)
+    initial_stake = state["initial_stake"]
+    target_profit = state["target_profit"]
+    stop_loss = state["stop_loss"]
+    paper_target_profit = state["paper_target_profit"]
+    paper_stop_loss = state["paper_stop_loss"]
+    MARTINGALE_FACTOR = state["martingale_factor"]
+    MAX_MARTINGALE_STAGES = state["max_martingale_stages"]
+    asset_cache.ttl = state["asset_cache_ttl"]
+    session_calendar = state["session_calendar"]
+    for pipeline in [signal_pipeline] + [pipeline for _, _, pipeline in paper_variants]:
+        pipeline.auto_reorder = state["auto_reorder"]
+
+    settings = state["profiler"]
+    profiler.output_dir = settings["output_dir"]
+    profiler.interval = settings["interval"]
+    profiler.slow_callback_ms = settings["slow_callback_ms"]
+    profiler.duration = settings["duration"]
+    if settings["enabled"] and not profiler_enabled:
+        profiler.start()
+    profiler_enabled = settings["enabled"]
+
+    # Only pick up a new stake between martingale sequences
+    if martingale_stage == 0:
+        current_stake = initial_stake
+    logging.info(f"⚙️ Stake: {initial_stake} | Target: {target_profit} | Stop Loss: {stop_loss} | Assets: {len(cfg['assets'])}")
 
-async def apply_trade(client, asset, error_candle):
-    global current_stake, martingale_stage, initial_stake
+async def apply_trade(client, asset, error_candle, trace=None):
+    global current_stake, martingale_stage, initial_stake, martingale_asset
     
     # Ensure current_stake is correctly initialized
     if current_stake is None:
         current_stake = initial_stake
 
-    outcome = await place_trade_at_next_candle_start(client, asset, error_candle, current_stake)
+    outcome = await place_trade_at_next_candle_start(client, asset, error_candle, current_stake, trace)
+    if trace is not None:
+        trace.outcome = outcome
+        trace_writer.write(trace)
+
+    if outcome is None:
+        return  # The order was never placed, so there is nothing to count or martingale on
+    await record_outcome(client, asset, outcome)
 
+# Next (stake, stage) after a settled trade: multiply after a loss up to the max stage,
+# reset after a win or past the max; a doji leaves both alone
+def next_martingale(stake, stage, base_stake, outcome):
+    if outcome == "win":
+        return base_stake, 0
+    if outcome == "loss":
+        if stage <= MAX_MARTINGALE_STAGES:
+            return stake * MARTINGALE_FACTOR, stage + 1
+        return base_stake, 0
+    return stake, stage
+
+# Update stake, martingale stage and summary from a settled trade
+async def record_outcome(client, asset, outcome):
+    global current_stake, martingale_stage, martingale_asset, open_trade, session_ended
+
+    open_trade = None
     trade_summary["total_trades"] += 1
+    current_stake, martingale_stage = next_martingale(current_stake, martingale_stage, initial_stake, outcome)
     if outcome == "win":
         trade_summary["wins"] += 1
-        current_stake = initial_stake  # ✅ Reset stake on win
-        martingale_stage = 0  # ✅ Reset Martingale stage
+        martingale_asset = None
         logging.info(f"✅ Trade WON! 🎉 Stake reset to {initial_stake}")
     
     elif outcome == "loss":
         trade_summary["losses"] += 1
         
-        if martingale_stage <= MAX_MARTINGALE_STAGES:
-            current_stake *= MARTINGALE_FACTOR  # ✅ Increase stake
-            martingale_stage += 1
+        if martingale_stage:
+            if martingale_asset is None:
+                martingale_asset = asset
             logging.info(f"❌ Trade LOST. Next stake: {current_stake} (Martingale Stage: {martingale_stage})")
         else:
-            current_stake = initial_stake  # ✅ Reset stake after max Martingale stage
-            martingale_stage = 0
+            martingale_asset = None
             logging.info(f"❌ Trade LOST. Max Martingale stage reached! Resetting stake to {initial_stake}")
 
     else:
         trade_summary["dojis"] += 1
         logging.info(f"⏸️ Trade resulted in a Doji. Stake remains at {current_stake}")
 
+    save_session()
+
     # Print trade summary
     logging.info(f"📊 Total Trades: {trade_summary['total_trades']} | Wins: {trade_summary['wins']} | Losses: {trade_summary['losses']} | Dojis: {trade_summary['dojis']}")
     
-    # Stop trading if balance limit is reached
+    # Stop trading if balance limit is reached; trade_loop stops once it sees the flag
     stop_trading = await check_balance(client)
     if stop_trading:
+        session_ended = True
+        save_session()
         logging.info("🚀 Trading Session Ended.")
-        exit()
 
 
 import time
 import asyncio
 import logging
-import numpy as np
 
-async def place_trade_at_next_candle_start(client, asset, error_candle, stake):
+async def place_trade_at_next_candle_start(client, asset, error_candle, stake, trace=None):
+    global open_trade
     direction = "put" if error_candle["close"] > error_candle["open"] else "call"
     logging.info(f"🚀 Preparing to place a trade for {asset} at the next candle's start: {direction} | Stake: {stake}")
 
     # Wait until the next candle start
-    current_time = int(time.time())
+    current_time = int(clock.time())
     seconds_to_next_candle = 59 - (current_time % 60)
-    await asyncio.sleep(seconds_to_next_candle)
+    await clock.sleep(seconds_to_next_candle)
 
     logging.info(f"📌 Placing trade for {asset} at next candle start: {direction} with stake {stake}")
 
     # Place the trade
+    if trace is not None:
+        trace.mark("order_submitted")
     status, buy_info = await client.buy(stake, asset, direction, 60)
+    if trace is not None:
+        trace.mark("order_acknowledged")
     if not status:
         logging.error(f"❌ Trade placement failed for {asset}.")
         return None
 
+    if buy_info.get("profit") and stake:
+        # A real confirmation carries the live payout; keep the cache current between refreshes.
+        # Paper fills only echo the cache (or its default) back, so they must not write to it.
+        if not paper_mode:
+            asset_cache.update(asset, payout=buy_info["profit"] / stake * 100)
+        if trace is not None:
+            trace.stake = stake
+            trace.payout = buy_info["profit"] / stake
+
     trade_id = buy_info.get("id", None)
     if not trade_id:
         logging.error(f"⚠️ Trade ID missing. Could not verify trade outcome for {asset}.")
         return "undetermined"
 
-    # Check trade outcome
-    await asyncio.sleep(61)  # Wait for the trade duration
-    win_status = await client.check_win(trade_id) 
+    open_trade = {"asset": asset, "id": trade_id, "direction": direction, "stake": stake,
+                  "expires_at": clock.time() + 60}
+    save_session()
+
+    # Check trade outcome once the option has expired
+    remaining = open_trade["expires_at"] - clock.time()
+    if remaining > 0:
+        await clock.sleep(remaining)
+    if trace is not None:
+        trace.mark("expired")
+    win_status = await client.check_win(trade_id)
+    if trace is not None:
+        trace.mark("settled")
 
     if win_status is True:  # Explicitly check for True
         logging.info(f"✅ Win!!! 🎉 We won, buddy!!! Profit: {buy_info['profit']}")
@@ -228,124 +314,313 @@ async def place_trade_at_next_candle_start(client, asset, error_candle, stake):
         logging.error(f"⚠️ Unexpected trade result for {asset}: {win_status}")
         return "undetermined"
 
-# Function to check if the market is too volatile
-def is_market_volatile(data):
-    if len(data) < 5:
-        return False
-    avg_body = np.mean([abs(candle["close"] - candle["open"]) for candle in data[-5:]])
-    avg_wick = np.mean([(candle["high"] - candle["low"]) for candle in data[-5:]])
-    
-    # If wick is significantly larger than body, consider it volatile
-    return avg_wick > (2 * avg_body)
-
-# Function to check if the last candle is a Doji
-def is_doji(candle):
-    body_size = abs(candle["close"] - candle["open"])
-    total_range = candle["high"] - candle["low"]
-    
-    # A Doji is when the body is very small compared to the total range
-    return body_size < (0.1 * total_range)
-
-# Function to check if the last three candles are all the opposite direction
-def check_three_opposite_candles(data, direction):
-    if len(data) < 3:
-        return False  # Not enough data
-
-    last_three = data[-3:]  # Get the last three candles
-    
-    # Check if all last three candles are green (bullish)
-    if direction == "put" and all(candle["close"] > candle["open"] for candle in last_three):
-        logging.info("🚫 Three consecutive GREEN candles detected. Skipping PUT trade.")
-        return True
-    
-    # Check if all last three candles are red (bearish)
-    if direction == "call" and all(candle["close"] < candle["open"] for candle in last_three):
-        logging.info("🚫 Three consecutive RED candles detected. Skipping CALL trade.")
-        return True
+# NumPy-backed modules, imported off the event loop during startup
+def import_analysis_modules():
+    return importlib.import_module("batch_indicators"), importlib.import_module("correlation_tracker")
+
+def log_first_signal():
+    global first_signal_logged
+    if not first_signal_logged:
+        first_signal_logged = True
+        logging.info(f"⏱️ Time to first signal: {time.perf_counter() - STARTED_AT:.2f}s")
+
+# Filter and pattern stages; each returns None to pass or the reason for skipping
+def volatility_stage(ctx):
+    if ctx["filters"]["volatility"] and ctx["signals"]["volatile"]:
+        return f"🚫 {ctx['asset']} Market is too volatile. Skipping trade."
+
+def doji_stage(ctx):
+    if ctx["filters"]["doji"] and ctx["signals"]["doji"]:
+        return f"🚫 {ctx['asset']} Doji detected. Skipping trade."
+
+def three_opposite_stage(ctx):
+    signals = ctx["signals"]
+    direction = ctx["direction"]
+    three_opposite = signals["three_green"] if direction == "put" else signals["three_red"]
+    if ctx["filters"]["three_opposite"] and three_opposite:
+        return f"🚫 {ctx['asset']} Last 3 candles are {direction.upper()}. Avoiding trade."
+
+def trend_stage(ctx):
+    if ctx["signals"]["trend"] not in ("Bullish", "Bearish"):
+        return f"🚫 No valid trading opportunity for {ctx['asset']}."
+
+# Trade only if an enabled pattern matches the trend
+def pattern_stage(ctx):
+    trend = ctx["signals"]["trend"]
+    if trend not in ("Bullish", "Bearish"):
+        return ""
+    side = trend.lower()
+    if not any(ctx["signals"][f"{side}_{pattern}"] for pattern in ctx["patterns"]):
+        return ""
+
+# Don't stack risk onto an asset that moves with one already at stake, directly or
+# through a chain of correlated assets
+def correlation_stage(ctx):
+    settings = config["correlation"]
+    if correlations is None or not settings["enabled"] or not ctx["open_assets"]:
+        return None
+    cluster = correlations.cluster_of(ctx["asset"], settings["threshold"])
+    for other in ctx["open_assets"]:
+        if other != ctx["asset"] and other in cluster:
+            return (f"🚫 {ctx['asset']} is in the same correlation cluster ({len(cluster)} assets) as "
+                    f"{other}, which is already at stake. Skipping trade.")
+
+def build_pipeline(auto_reorder=False):
+    # Correlation starts first: it returns at once when nothing is at stake, and behind the
+    # rarely-passing pattern stage it would never collect the calls reordering waits for
+    return FilterPipeline([
+        Stage("correlation", correlation_stage),
+        Stage("volatility", volatility_stage),
+        Stage("doji", doji_stage),
+        Stage("three_opposite", three_opposite_stage),
+        Stage("trend", trend_stage),
+        Stage("pattern", pattern_stage),
+    ], auto_reorder)
+
+signal_pipeline = build_pipeline()
+cycle_phases = PhaseTimer()
+
+# Filters and patterns for one asset; returns (direction, None) or (None, reason).
+# open_assets are the assets already at stake, for the correlation stage.
+def evaluate_signal(asset, candles, signals, filters, patterns, pipeline=None, open_assets=()):
+    error_candle = candles[-1]  # Latest candle
+
+    # Determine the direction for filtering opposite candles
+    direction = "put" if error_candle["close"] > error_candle["open"] else "call"
 
-    return False  # No filter triggered
+    ctx = {"asset": asset, "signals": signals, "direction": direction, "filters": filters, "patterns": patterns,
+           "open_assets": open_assets}
+    reason = (pipeline or signal_pipeline).run(ctx)
+    if reason is not None:
+        return None, reason or None
+    return direction, None
 
-async def analyze_asset(client, asset):
+# Decide on one asset using the indicators computed for the whole batch
+async def analyze_asset(client, asset, candles, signals, trace=None):
+    global main_trade
     try:
-        current_time = int(time.time())
-        candles = await client.get_candles(asset, current_time, 10800, 60)
-        if not candles:
-            logging.warning(f"No candles available for {asset}.")
-            return
-        
-        trend = identify_trend(candles)
+        trend = signals["trend"]
         logging.info(f"{asset} Market Trend: {trend}")
 
-        error_candle = candles[-1]  # Latest candle
-
-        # Determine the direction for filtering opposite candles
-        direction = "put" if error_candle["close"] > error_candle["open"] else "call"
-
-        # Apply the new filters
-        if is_market_volatile(candles):
-            logging.info(f"🚫 {asset} Market is too volatile. Skipping trade.")
-            return
-        
-        if is_doji(error_candle):
-            logging.info(f"🚫 {asset} Doji detected. Skipping trade.")
-            return
-        
-        if check_three_opposite_candles(candles, direction):  # Now correctly passing 'direction'
-            logging.info(f"🚫 {asset} Last 3 candles are {direction.upper()}. Avoiding trade.")
-            return
-
-        # Trade only if the pattern matches the trend
-        if trend == "Bullish":
-            if (
-                check_bullish_engulfing(candles) or 
-                check_bullish_harami(candles) or 
-                check_bullish_pin_bar(candles)
-            ):
-                logging.info(f"📈 Bullish pattern detected for {asset}. Entering trade.")
-                await apply_trade(client, asset, error_candle)
-        elif trend == "Bearish":
-            if (
-                check_bearish_engulfing(candles) or 
-                check_bearish_harami(candles) or 
-                check_bearish_pin_bar(candles)
-            ):
-                logging.info(f"📉 Bearish pattern detected for {asset}. Entering trade.")
-                await apply_trade(client, asset, error_candle)
-        else:
-            logging.info(f"🚫 No valid trading opportunity for {asset}.")
+        # Only a trade that has not settled yet is at stake
+        open_assets = (open_trade["asset"],) if open_trade else ()
+        direction, reason = evaluate_signal(asset, candles, signals, config["filters"], config["patterns"],
+                                            open_assets=open_assets)
+        if direction is None:
+            if reason:
+                logging.info(reason)
+            return False
+
+        icon = "📈" if trend == "Bullish" else "📉"
+        logging.info(f"{icon} {trend} pattern detected for {asset}. Entering trade.")
+        if trace is not None:
+            trace.mark("decision")
+        log_first_signal()
+        main_trade = asyncio.create_task(run_main_trade(client, asset, candles[-1], trace))
+        return True
     except Exception as e:
         logging.error(f"Error analyzing {asset}: {e}")
+    return False
+
+# The main session's trade, run as a task so the scan loop keeps evaluating the variants
+async def run_main_trade(client, asset, error_candle, trace=None):
+    try:
+        await apply_trade(client, asset, error_candle, trace)
+    except Exception as e:
+        logging.error(f"Error trading {asset}: {e}")
+        if open_trade:
+            # The order went through but settling it failed; account for it before the next trade
+            await reattach_open_trade(client)
+
+# Paper-trade every configured strategy variant off the same candles and indicators
+def run_paper_variants(candles_by_asset, indicators):
+    for broker, variant, pipeline in paper_variants:
+        filters = {**config["filters"], **variant.get("filters", {})}
+        patterns = variant.get("patterns", config["patterns"])
+        at_stake = broker.open_assets() | {asset for name, asset in paper_pending if name == broker.name}
+        for asset, candles in candles_by_asset.items():
+            key = (broker.name, asset)
+            if asset not in indicators or key in paper_pending:
+                continue
+            direction, _ = evaluate_signal(asset, candles, indicators.for_asset(asset), filters, patterns, pipeline,
+                                           at_stake)
+            if direction:
+                task = asyncio.create_task(run_variant_trade(broker, variant, asset, direction))
+                at_stake.add(asset)
+                paper_pending.add(key)
+                paper_tasks.add(task)
+                task.add_done_callback(paper_tasks.discard)
+                task.add_done_callback(lambda _, key=key: paper_pending.discard(key))
+
+# One variant trade at the variant's current martingale stake, then the variant's next stake
+async def run_variant_trade(broker, variant, asset, direction):
+    base_stake = variant.get("stake", initial_stake)
+    sizing = paper_sizing.setdefault(broker.name, {"stake": base_stake, "stage": 0})
+    outcome = await run_paper_trade(broker, asset, direction, sizing["stake"])
+    sizing["stake"], sizing["stage"] = next_martingale(sizing["stake"], sizing["stage"], base_stake, outcome)
 
 
 async def main():
-    global initial_balance, initial_stake, target_profit, stop_loss
-    assets = ["BRLUSD_otc","CADCHF_otc", "GBPJPY_otc", "USDIDR_otc",
-              "NZDUSD_otc", "GBPCHF_otc", "USDINR_otc", "NZDJPY_otc",
-              "NZDCAD_otc", "USDMXN_otc", "USDBDT_otc", "USDPKR_otc", 
-              "USDNGN_otc", "USDPHP_otc", "USDTRY_otc", "USDEGP_otc", 
-              "USDZAR_otc", "USDARS_otc", "USDDZD_otc"]
-
-    client = Quotex(email, password)
+    global initial_balance, config, trace_writer, correlations, checkpoint, clock, paper_mode
+    try:
+        config = ConfigWatcher()
+        apply_config(config.config)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logging.error(f"❌ Cannot start without a valid config: {e}")
+        return
+    config.on_change(apply_config, validate=build_config_state)
+
+    # Replay a recording instead of connecting, to reproduce exactly what the bot saw.
+    # It runs on the recording's clock with paper fills, and never touches live traces or the checkpoint.
+    replay = config["replay"]
+    replay_client = ReplayClient(replay["dir"], replay["speed"]) if replay["dir"] else None
+    # A replay always trades on paper, filled at the recorded prices
+    paper_mode = bool(replay_client) or config["paper"]["enabled"]
+    saved_state = None
+    if replay_client:
+        clock = replay_client
+    else:
+        # Paper sessions keep their own traces and state, so they never feed the live latency
+        # estimate or win rate, and a live restart never re-attaches to a simulated trade
+        files = config["paper"] if config["paper"]["enabled"] else config
+        trace_writer = TraceWriter(files["trace_file"])
+        checkpoint = Checkpoint(files["checkpoint_file"])
+        saved_state = checkpoint.load() if config["resume"] else None
+
+    # Import NumPy and the batch engine in a worker thread while the connection is set up
+    indicators_import = asyncio.create_task(asyncio.to_thread(import_analysis_modules))
+
+    client = replay_client or Quotex(email, password)
     connected, _ = await client.connect()
     if not connected:
         logging.error("❌ Failed to connect to Quotex.")
         return
+    logging.info(f"⏱️ Connected in {time.perf_counter() - STARTED_AT:.2f}s")
+
+    recorder = None
+    if config["record_dir"]:
+        recorder = MarketRecorder(config["record_dir"])
+        client = RecordingClient(client, recorder)
+    try:
+        await trade_loop(client, replay_client, indicators_import, saved_state)
+    except asyncio.CancelledError:
+        logging.info("🛑 Stopped.")
+    finally:
+        # Closing writes the gzip trailer, so the last chunk of the recording stays readable
+        if recorder is not None:
+            recorder.close()
+
+
+async def trade_loop(client, replay_client, indicators_import, saved_state):
+    global initial_balance, correlations
+
+    # Merge duplicate candle requests and keep the connection under the broker's rate limit.
+    # A replay has no connection to protect, and the wall-clock cache and bucket would skew its timing.
+    request_layer = None
+    if not replay_client:
+        limits = config["candle_requests"]
+        client = request_layer = CandleRequestLayer(client, limits["rate"], limits["burst"], limits["cache_ttl"])
+
+    # Paper mode: live candles, simulated fills; variants share the same connection
+    paper = config["paper"]
+    if paper_mode:
+        latency = measured_order_latency(config["trace_file"]) if paper["latency"] == "auto" else paper["latency"]
+        logging.info(f"📝 Paper trading with {latency * 1000:.0f}ms simulated order latency")
+        data_client = client
+        client = PaperBroker(data_client, "main", paper["balance"], latency, asset_cache, clock)
+        for name, variant in paper["variants"].items():
+            paper_variants.append((PaperBroker(data_client, name, paper["balance"], latency, asset_cache, clock), variant,
+                                   build_pipeline(config["pipeline"]["auto_reorder"])))
 
     # Fetch initial balance
     initial_balance = await client.get_balance()
     logging.info(f"💰 Initial Account Balance: {initial_balance}")
 
-    # Get user inputs
-    initial_stake = float(input("Enter Initial Stake: "))
-    target_profit = float(input("Enter Target Profit Amount: "))
-    stop_loss = float(input("Enter Stop Loss Amount: "))
+    if saved_state:
+        restore_session(saved_state)
+        if session_ended:
+            logging.info(f"🛑 This session already hit its target or stop loss. Delete {checkpoint.path} "
+                         f"or set \"resume\": false to start a new one.")
+            return
+        if open_trade:
+            await reattach_open_trade(client)
+    save_session()
+
+    # Don't place a trade if the balance is already past a limit
+    if not session_ended and await check_balance(client):
+        logging.info("🚀 Trading Session Ended.")
+        return
 
-    while True:
-        for asset in assets:
-            await analyze_asset(client, asset)
-            await asyncio.sleep(1)
+    # Pick up config edits live, without reconnecting
+    watcher = asyncio.create_task(config.watch())
+    loop = asyncio.get_running_loop()
+    # `kill -USR1 <pid>` profiles the running bot without stopping it
+    profiler.install_signal_handler(loop)
+    # SIGTERM unwinds through main() so the recording is closed cleanly
+    try:
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    batch_indicators = None
+    cycles = 0
+    while not session_ended and not (replay_client and replay_client.finished()):
+        await asset_cache.maybe_refresh(client)
+        # Drop closed, low-payout and out-of-session assets before requesting any candles
+        now = clock.time()
+        assets = [asset for asset in config["assets"]
+                  if asset_cache.is_tradeable(asset, config["min_payout"]) and session_calendar.is_allowed(asset, now)]
+        if not assets:
+            await clock.sleep(config["scan_delay"])
+            continue
+        # Fetch every asset at once so the whole snapshot is seconds old, not a full serial sweep
+        with cycle_phases.phase("fetch"):
+            candles_by_asset, received_at = await fetch_all_candles(client, assets, config["fetch_concurrency"], clock)
+        if cycles == 0:
+            logging.info(f"⏱️ Warmed up {len(candles_by_asset)} assets in {time.perf_counter() - STARTED_AT:.2f}s")
+
+        if batch_indicators is None:
+            batch_indicators, correlation_tracker = await indicators_import
+            correlations = correlation_tracker.CorrelationTracker(config["correlation"]["window"],
+                                                                  config["correlation"]["threshold"])
+
+        # One vectorized pass computes trend, filters and patterns for every asset
+        with cycle_phases.phase("price_matrix"):
+            prices = batch_indicators.PriceMatrix(candles_by_asset)
+        with cycle_phases.phase("indicators"):
+            indicators = batch_indicators.compute_indicators(prices, SHORT_TERM_PERIOD, LONG_TERM_PERIOD, RSI_PERIOD)
+        indicators_done = clock.time()
+        with cycle_phases.phase("correlations"):
+            correlations.update_from_matrix(prices)
+        with cycle_phases.phase("variants"):
+            run_paper_variants(candles_by_asset, indicators)
+
+        cycles += 1
+        if cycles % config["pipeline"]["report_every"] == 0:
+            logging.info(cycle_phases.report())
+            logging.info(signal_pipeline.report())
+            if request_layer:
+                logging.info(request_layer.summary())
+        # The main session trades one martingale sequence at a time; while its trade runs,
+        # the loop keeps scanning for the variants only
+        if main_trade is None or main_trade.done():
+            with cycle_phases.phase("signals"):
+                for asset, candles in candles_by_asset.items():
+                    if asset not in indicators:
+                        continue
+                    # The latest candle opened when the previous one closed
+                    trace = Trace(asset, candle_close=candles[-1]["time"], data_received=received_at[asset],
+                                  indicators_done=indicators_done) if trace_writer else None
+                    if await analyze_asset(client, asset, candles, indicators.for_asset(asset), trace):
+                        break
+        await clock.sleep(config["scan_delay"])
+
+    if main_trade is not None:
+        await main_trade
+    if replay_client:
+        logging.info("📼 Replay finished.")
+        for broker in [client] + [broker for broker, _, _ in paper_variants]:
+            logging.info(broker.summary())
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-#need too add 1️⃣ Add a Volatility Filter 📊 5️⃣ Use a Time-Based Filter ⏰
\ No newline at end of file